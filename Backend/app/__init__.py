@@ -47,12 +47,14 @@ def create_app():
     # ✅ No Flask-Session init—Flask’s secure cookie sessions are used.
 
     # ===== Import Models =====
-    from app.models import User, Product, Order, OrderItem, Address, Payment, Notification
+    from app.models import User, Product, Order, OrderItem, OrderEvent, SellerDailyStat, SellerBuyer, Cart, CartItem, Address, Payment, Notification
 
     # ===== Register Blueprints =====
     from routes.user import auth_bp
     from routes.Products import products_bp
     from routes.checkout import checkout_bp
+    from routes.cart import cart_bp
+    from routes.payments import payments_bp
     from routes.notifications import notifications_bp
     from routes.admin_routes import admin_bp
     from routes.admin_seller_routes import admin_seller_bp
@@ -62,11 +64,16 @@ def create_app():
     app.register_blueprint(auth_bp)
     app.register_blueprint(products_bp)
     app.register_blueprint(checkout_bp)
+    app.register_blueprint(cart_bp)
+    app.register_blueprint(payments_bp)
     app.register_blueprint(notifications_bp)
     app.register_blueprint(admin_bp, url_prefix="/admin")
     app.register_blueprint(admin_seller_bp, url_prefix="/admin_sellers")
     app.register_blueprint(seller_orders_bp)
-    
+
+    # ===== CLI Commands =====
+    from app.commands import register_commands
+    register_commands(app)
 
     return app
 
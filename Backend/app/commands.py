@@ -0,0 +1,56 @@
+# app/commands.py
+import click
+from datetime import timedelta
+
+
+def register_commands(app):
+    """Register the `flask ...` maintenance commands"""
+
+    @app.cli.command("sweep-payments")
+    def sweep_payments_command():
+        """Resubmit stuck payments and fail the ones that timed out."""
+        from utils.payments import sweep_payments
+
+        resubmitted, expired = sweep_payments()
+        click.echo(f"Resubmitted {resubmitted} payment(s), expired {expired} payment(s)")
+
+    @app.cli.command("backfill-seller-stats")
+    @click.option("--start", type=click.DateTime(formats=["%Y-%m-%d"]), help="First day to rebuild (default: first order).")
+    @click.option("--end", type=click.DateTime(formats=["%Y-%m-%d"]), help="Last day to rebuild, inclusive (default: today).")
+    def backfill_seller_stats_command(start, end):
+        """Rebuild the seller_daily_stats rollup for a date range."""
+        from utils.rollups import backfill_seller_stats
+
+        if end is not None:
+            end = end + timedelta(days=1)
+        written = backfill_seller_stats(start, end)
+        click.echo(f"Wrote {written} seller_daily_stats row(s)")
+
+    @app.cli.command("backfill-platform-stats")
+    @click.option("--start", type=click.DateTime(formats=["%Y-%m-%d"]), help="First day to rebuild (default: first order or registration).")
+    @click.option("--end", type=click.DateTime(formats=["%Y-%m-%d"]), help="Last day to rebuild, inclusive (default: today).")
+    def backfill_platform_stats_command(start, end):
+        """Rebuild the platform_daily_stats rollup for a date range."""
+        from utils.rollups import backfill_platform_stats
+
+        if end is not None:
+            end = end + timedelta(days=1)
+        written = backfill_platform_stats(start, end)
+        click.echo(f"Wrote {written} platform_daily_stats row(s)")
+
+    @app.cli.command("backfill-seller-buyers")
+    def backfill_seller_buyers_command():
+        """Rebuild the seller_buyers first-purchase table from all orders."""
+        from utils.rollups import backfill_seller_buyers
+
+        written = backfill_seller_buyers()
+        click.echo(f"Wrote {written} seller_buyers row(s)")
+
+    @app.cli.command("scan-low-stock")
+    @click.option("--batch-size", type=int, default=None, help="Changed products per transaction (default: LOW_STOCK_SCAN_BATCH_SIZE).")
+    def scan_low_stock_command(batch_size):
+        """Notify sellers about products that fell below their low-stock threshold."""
+        from utils.stock_alerts import scan_low_stock
+
+        sellers, products, restocked = scan_low_stock(batch_size)
+        click.echo(f"Alerted {sellers} seller(s) about {products} product(s); {restocked} product(s) restocked")
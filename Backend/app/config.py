@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 
 class Config:
@@ -8,6 +9,41 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URI", "sqlite:///garissa.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Order numbers - every host running the app needs a distinct host id (0-31); the
+    # processes on a host claim distinct worker slots through lock files in this directory
+    ORDER_HOST_ID = int(os.getenv("ORDER_HOST_ID", "0"))
+    ORDER_WORKER_LOCK_DIR = os.getenv("ORDER_WORKER_LOCK_DIR", os.path.join(tempfile.gettempdir(), "garissa-order-workers"))
+    ORDER_CLOCK_WAIT_MS = 2000  # longest wait for a clock that moved backwards before failing
+    ORDER_EVENT_COMMIT_LAG_SECONDS = 5  # event readers hold back events younger than this; must exceed the longest order transaction
+
+    # Payments - checkout payment method -> gateway name (see utils/payments.py)
+    PAYMENT_GATEWAYS = {
+        'card': 'simulator',
+        'mpesa': 'simulator',
+        'evc': 'simulator',
+        'paypill': 'simulator',
+    }
+    PAYMENT_WEBHOOK_SECRET = os.getenv("PAYMENT_WEBHOOK_SECRET")  # callbacks are rejected while unset
+    PAYMENT_WORKERS = 4
+    PAYMENT_GATEWAY_TIMEOUT_SECONDS = 15
+    PAYMENT_MAX_ATTEMPTS = 3
+    PAYMENT_RETRY_BACKOFF_SECONDS = 5
+    PAYMENT_TIMEOUT_SECONDS = 15 * 60          # submitted but never confirmed
+    PAYMENT_RESUBMIT_AFTER_SECONDS = 5 * 60    # pending but never picked up
+    PAYMENT_SIMULATOR_DELAY_SECONDS = 2
+    PLATFORM_FEE_RATE = 0.15                   # platform share of each sale; the rest is paid out to the seller
+
+    # In-process cache for dashboard aggregates (seconds)
+    CACHE_THRESHOLD = 5000
+    CACHE_DEFAULT_TIMEOUT = 60
+    SELLER_ORDER_STATS_TTL = 30
+    ADMIN_EARNINGS_TTL = 60
+    SELLER_DASHBOARD_TTL = 600  # invalidated on writes; the TTL only bounds staleness from other processes
+
+    # Low-stock alerts (`flask scan-low-stock`)
+    LOW_STOCK_THRESHOLD = 5            # default when a seller has not set their own
+    LOW_STOCK_SCAN_BATCH_SIZE = 500    # changed products per scanner transaction
+
     # CORS
     CORS_ORIGINS = [
         "http://localhost:5173",
@@ -24,6 +24,9 @@ class User(db.Model):
     status = db.Column(db.String(10), default='pending')  # 'pending', 'active', 'suspended'
     is_admin = db.Column(db.Boolean, default=False)
 
+    # Sellers: alert when a product's stock drops below this (NULL = Config.LOW_STOCK_THRESHOLD)
+    low_stock_threshold = db.Column(db.Integer, nullable=True)
+
     # Timestamps
     created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
     updated_at = db.Column(
@@ -92,6 +95,16 @@ class Product(db.Model):
     seller_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     seller = db.relationship('User', backref='products')
 
+    # Set when the seller was alerted about low stock; cleared once restocked
+    low_stock_notified_at = db.Column(db.DateTime, nullable=True)
+    # Set when the stock or the seller's threshold changed; cleared once the low-stock scanner has checked the product
+    stock_changed_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    # The low-stock listing reads each seller's products below a stock level
+    __table_args__ = (
+        db.Index('ix_products_seller_id_stock', 'seller_id', 'stock'),
+    )
+
     def to_dict(self):
         image_url = self.image_url
         if not image_url and self.image_filename:
@@ -135,6 +148,27 @@ class Order(db.Model):
     payment = db.relationship('Payment', backref='order', uselist=False, lazy=True)
     shipping_address = db.relationship('Address', foreign_keys=[shipping_address_id])
 
+    # Buyer order history is read newest-first per user
+    __table_args__ = (
+        db.Index('ix_orders_user_id_created_at', 'user_id', 'created_at', 'id'),
+    )
+
+    def to_summary_dict(self):
+        """Order fields only - does not touch any relationship"""
+        return {
+            "id": self.id,
+            "order_number": self.order_number,
+            "user_id": self.user_id,
+            "status": self.status,
+            "subtotal": self.subtotal,
+            "tax": self.tax,
+            "shipping": self.shipping,
+            "total": self.total,
+            "payment_method": self.payment_method,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -154,12 +188,36 @@ class Order(db.Model):
         }
 
 
+class OrderEvent(db.Model):
+    """Append-only log of order lifecycle changes; the id doubles as the consumer offset"""
+    __tablename__ = 'order_events'
+
+    id = db.Column(db.Integer, primary_key=True)
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False, index=True)
+    event_type = db.Column(db.String(20), nullable=False)  # 'created', 'status_changed', 'cancelled'
+    from_status = db.Column(db.String(20))
+    to_status = db.Column(db.String(20), nullable=False)
+    actor_id = db.Column(db.Integer, db.ForeignKey('users.id'))  # None for system changes
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "order_id": self.order_id,
+            "event_type": self.event_type,
+            "from_status": self.from_status,
+            "to_status": self.to_status,
+            "actor_id": self.actor_id,
+            "created_at": self.created_at.isoformat() if self.created_at else None
+        }
+
+
 class OrderItem(db.Model):
     __tablename__ = 'order_items'
     
     id = db.Column(db.Integer, primary_key=True)
     order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
-    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False, index=True)  # seller order lines join through it
     product = db.relationship('Product', backref='order_items')
     quantity = db.Column(db.Integer, nullable=False)
     price = db.Column(db.Float, nullable=False)
@@ -180,6 +238,91 @@ class OrderItem(db.Model):
         }
 
 
+class SellerDailyStat(db.Model):
+    """Per-seller daily order rollup, keyed by the day the order was placed and its current status"""
+    __tablename__ = 'seller_daily_stats'
+
+    seller_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    revenue = db.Column(db.Float, nullable=False, default=0.0)  # sum of the seller's line totals
+    orders = db.Column(db.Integer, nullable=False, default=0)
+    items = db.Column(db.Integer, nullable=False, default=0)  # units sold
+
+
+class SellerBuyer(db.Model):
+    """First and latest purchase of each buyer from each seller, maintained at checkout"""
+    __tablename__ = 'seller_buyers'
+
+    seller_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    buyer_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    first_order_at = db.Column(db.DateTime, nullable=False)
+    last_order_at = db.Column(db.DateTime, nullable=False)
+    order_count = db.Column(db.Integer, nullable=False, default=1)
+
+    # New buyers per period are range counts on first_order_at
+    __table_args__ = (
+        db.Index('ix_seller_buyers_seller_id_first_order_at', 'seller_id', 'first_order_at'),
+    )
+
+
+class PlatformDailyStat(db.Model):
+    """Platform-wide daily rollup: orders by the day they were placed (current status), users by the day they registered"""
+    __tablename__ = 'platform_daily_stats'
+
+    day = db.Column(db.Date, primary_key=True)
+    orders = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0.0)  # sum of line totals, every status
+    fees = db.Column(db.Float, nullable=False, default=0.0)  # platform share of revenue
+    # Buyers whose first order of the calendar month was placed that day; a month's rows sum to its distinct buyers
+    month_buyers = db.Column(db.Integer, nullable=False, default=0)
+    new_users = db.Column(db.Integer, nullable=False, default=0)
+
+    pending_orders = db.Column(db.Integer, nullable=False, default=0)
+    processing_orders = db.Column(db.Integer, nullable=False, default=0)
+    shipped_orders = db.Column(db.Integer, nullable=False, default=0)
+    delivered_orders = db.Column(db.Integer, nullable=False, default=0)
+    cancelled_orders = db.Column(db.Integer, nullable=False, default=0)
+    completed_revenue = db.Column(db.Float, nullable=False, default=0.0)  # delivered orders
+    pending_revenue = db.Column(db.Float, nullable=False, default=0.0)  # orders whose seller payout is outstanding
+
+
+class Cart(db.Model):
+    __tablename__ = 'carts'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), unique=True, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    items = db.relationship('CartItem', backref='cart', lazy=True, cascade='all, delete-orphan')
+
+
+class CartItem(db.Model):
+    __tablename__ = 'cart_items'
+
+    id = db.Column(db.Integer, primary_key=True)
+    cart_id = db.Column(db.Integer, db.ForeignKey('carts.id'), nullable=False, index=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
+    quantity = db.Column(db.Integer, nullable=False, default=1)
+    unit_price = db.Column(db.Float, nullable=False)  # price snapshot shown to the buyer
+    color = db.Column(db.String(20))
+    size = db.Column(db.String(10))
+    added_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "product_id": self.product_id,
+            "quantity": self.quantity,
+            "unit_price": self.unit_price,
+            "color": self.color,
+            "size": self.size,
+            "subtotal": self.unit_price * self.quantity,
+            "added_at": self.added_at.isoformat() if self.added_at else None
+        }
+
+
 class Address(db.Model):
     __tablename__ = 'addresses'
     
@@ -229,7 +372,16 @@ class Payment(db.Model):
     card_brand = db.Column(db.String(20))
     phone_number = db.Column(db.String(20))  # For M-Pesa/EVC
     paypill_email = db.Column(db.String(120))  # For PayPill
+    attempts = db.Column(db.Integer, default=0)  # gateway submissions so far
+    last_error = db.Column(db.String(255))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Callbacks look payments up by provider reference; the sweeper by status and age
+    __table_args__ = (
+        db.Index('ix_payments_transaction_id', 'transaction_id'),
+        db.Index('ix_payments_status_updated_at', 'status', 'updated_at'),
+    )
     
     def to_dict(self):
         return {
@@ -244,7 +396,10 @@ class Payment(db.Model):
             "card_brand": self.card_brand,
             "phone_number": self.phone_number,
             "paypill_email": self.paypill_email,
-            "created_at": self.created_at.isoformat() if self.created_at else None
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
     
 
@@ -259,6 +414,11 @@ class Notification(db.Model):
     target_user = db.Column(db.Integer, db.ForeignKey('users.id'))  # seller_id or buyer_id
     date = db.Column(db.DateTime, default=datetime.utcnow)
     read = db.Column(db.Boolean, default=False)
+
+    # The seller dashboard reads a user's latest notifications on every load
+    __table_args__ = (
+        db.Index('ix_notifications_target_user_date', 'target_user', 'date'),
+    )
     
     def to_dict(self):
         return {
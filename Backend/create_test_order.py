@@ -9,15 +9,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app import create_app, db
 from app.models import User, Product, Order, OrderItem, Address, Payment, Notification
+from utils.order_numbers import generate_order_number
 from datetime import datetime
-import random
-import string
-
-def generate_order_number():
-    """Generate a unique order number"""
-    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-    random_str = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-    return f"ORD-{timestamp}-{random_str}"
 
 def create_test_order():
     app = create_app()
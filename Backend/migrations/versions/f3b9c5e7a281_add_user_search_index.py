@@ -0,0 +1,66 @@
+"""add user search index
+
+Revision ID: f3b9c5e7a281
+Revises: d2f6b8a4c913
+Create Date: 2026-10-19 19:14:52.908341
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b9c5e7a281'
+down_revision = 'd2f6b8a4c913'
+branch_labels = None
+depends_on = None
+
+# Must stay identical to the search document in utils/user_search.py for the index to be used
+SEARCH_DOCUMENT = "(firstname || ' ' || secondname || ' ' || email || ' ' || coalesce(phone, ''))"
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        # Trigram FTS5 index over the users table, kept in sync by triggers
+        op.execute(
+            "CREATE VIRTUAL TABLE users_fts USING fts5("
+            "firstname, secondname, email, phone, "
+            "content='users', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(
+            "CREATE TRIGGER users_fts_insert AFTER INSERT ON users BEGIN "
+            "INSERT INTO users_fts(rowid, firstname, secondname, email, phone) "
+            "VALUES (new.id, new.firstname, new.secondname, new.email, new.phone); END"
+        )
+        op.execute(
+            "CREATE TRIGGER users_fts_delete AFTER DELETE ON users BEGIN "
+            "INSERT INTO users_fts(users_fts, rowid, firstname, secondname, email, phone) "
+            "VALUES ('delete', old.id, old.firstname, old.secondname, old.email, old.phone); END"
+        )
+        op.execute(
+            "CREATE TRIGGER users_fts_update AFTER UPDATE OF firstname, secondname, email, phone ON users BEGIN "
+            "INSERT INTO users_fts(users_fts, rowid, firstname, secondname, email, phone) "
+            "VALUES ('delete', old.id, old.firstname, old.secondname, old.email, old.phone); "
+            "INSERT INTO users_fts(rowid, firstname, secondname, email, phone) "
+            "VALUES (new.id, new.firstname, new.secondname, new.email, new.phone); END"
+        )
+        op.execute("INSERT INTO users_fts(users_fts) VALUES ('rebuild')")
+
+    elif dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(f"CREATE INDEX ix_users_search_trgm ON users USING gin ({SEARCH_DOCUMENT} gin_trgm_ops)")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS users_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS users_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS users_fts_insert")
+        op.execute("DROP TABLE IF EXISTS users_fts")
+
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_users_search_trgm")
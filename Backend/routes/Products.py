@@ -1,9 +1,11 @@
 import os
 import uuid
+from datetime import datetime
 from werkzeug.utils import secure_filename
 from flask import Blueprint, request, jsonify, session
 from app import db
 from app.models import Product, User
+from utils.cache import invalidate_seller
 
 products_bp = Blueprint('products', __name__)
 
@@ -119,6 +121,7 @@ def products():
 
             db.session.add(new_product)
             db.session.commit()
+            invalidate_seller([seller_id], 'dashboard')
             return jsonify({"product": new_product.to_dict()}), 201
 
         except Exception as e:
@@ -143,6 +146,7 @@ def product_detail(product_id):
             }, 200)
 
         elif request.method == 'PUT':
+            previous_stock = product.stock
             if request.files:
                 image_file = request.files.get('image')
                 if image_file:
@@ -175,7 +179,11 @@ def product_detail(product_id):
                 product.is_new = data['isNew']
                 product.is_best_seller = data['isBestSeller']
 
+            # The low-stock scanner only checks products whose stock changed
+            if product.stock != previous_stock:
+                product.stock_changed_at = datetime.utcnow()
             db.session.commit()
+            invalidate_seller([seller_id], 'dashboard')
             return jsonify({"product": product.to_dict()}), 200
 
         elif request.method == 'DELETE':
@@ -183,6 +191,7 @@ def product_detail(product_id):
                 delete_image_file(product.image_filename)
             db.session.delete(product)
             db.session.commit()
+            invalidate_seller([seller_id], 'dashboard')
             return jsonify({'message': 'Product deleted successfully'}), 200
 
     except Exception as e:
@@ -1,7 +1,14 @@
 from flask import Blueprint, request, jsonify, session
 from app import db
-from app.models import User, Order, OrderItem, Product
-from sqlalchemy import func
+from app.models import User, Order, OrderItem
+from utils.order_events import EVENT_TYPES, read_order_events
+from utils.exports import EXPORT_FORMATS, parse_date_range, order_lines_query, stream_order_lines
+from utils.pagination import encode_cursor, after_cursor
+from utils.user_search import search_users
+from utils.admin_reports import (
+    SELLER_ORDER_SORTS, build_platform_analytics, build_platform_earnings, platform_order_totals, platform_user_counts,
+    seller_order_stats
+)
 
 admin_bp = Blueprint("admin", __name__)
 
@@ -15,6 +22,16 @@ def require_admin_auth():
         return False
     return True
 
+def _user_summary(user):
+    return {
+        "id": user.id,
+        "firstname": user.firstname,
+        "secondname": user.secondname,
+        "email": user.email,
+        "phone": user.phone,
+        "status": getattr(user, "status", "active"),
+    }
+
 # -------------------------
 # GET admin dashboard stats
 # -------------------------
@@ -25,24 +42,20 @@ def get_admin_dashboard_stats():
         return jsonify({"error": "Unauthorized - Admin access required"}), 401
 
     try:
-        # Get total counts
-        total_sellers = User.query.filter_by(account_type="seller").count()
-        total_buyers = User.query.filter_by(account_type="buyer").count()
-        total_orders = Order.query.count()
-        
-        # Get total revenue from all orders
-        total_revenue_result = db.session.query(
-            func.sum(OrderItem.price * OrderItem.quantity)
-        ).join(Order).scalar()
-        total_revenue = float(total_revenue_result) if total_revenue_result else 0.0
-        
-        # Get active sellers and buyers
-        active_sellers = User.query.filter_by(account_type="seller", status="active").count()
-        active_buyers = User.query.filter_by(account_type="buyer", status="active").count()
-        
-        # Get orders by status
-        pending_orders = Order.query.filter_by(status="pending").count()
-        completed_orders = Order.query.filter_by(status="delivered").count()
+        # Headline counters: one conditional-aggregation query over users,
+        # order figures summed from the platform_daily_stats rollup
+        user_counts = platform_user_counts()
+        order_totals = platform_order_totals()
+
+        total_sellers = user_counts["sellers"]
+        total_buyers = user_counts["buyers"]
+        active_sellers = user_counts["active_sellers"]
+        active_buyers = user_counts["active_buyers"]
+
+        total_orders = order_totals["orders"]
+        total_revenue = float(order_totals["revenue"])
+        pending_orders = order_totals["pending_orders"]
+        completed_orders = order_totals["delivered_orders"]
         
         # Calculate growth percentages (simplified - you can enhance with real time-based calculations)
         seller_growth = 12.0 if total_sellers > 0 else 0.0
@@ -70,6 +83,35 @@ def get_admin_dashboard_stats():
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
+# -------------------------
+# GET order events after an offset
+# -------------------------
+@admin_bp.route("/order-events", methods=["GET"])
+def get_order_events():
+    """Read the order event log incrementally, starting after a given offset"""
+    if not require_admin_auth():
+        return jsonify({"error": "Unauthorized - Admin access required"}), 401
+
+    try:
+        after = request.args.get("after", 0, type=int)
+        limit = min(max(request.args.get("limit", 100, type=int), 1), 1000)
+        types = [t for t in request.args.get("types", "", type=str).split(",") if t]
+
+        invalid = [t for t in types if t not in EVENT_TYPES]
+        if invalid:
+            return jsonify({"error": f"Invalid event type. Must be one of: {', '.join(EVENT_TYPES)}"}), 400
+
+        events = read_order_events(after=after, limit=limit, event_types=types)
+
+        return jsonify({
+            "events": [event.to_dict() for event in events],
+            "next_offset": events[-1].id if events else after,
+            "has_more": len(events) == limit
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
 # -------------------------
 # GET all buyers
 # -------------------------
@@ -82,32 +124,33 @@ def get_buyers():
     try:
         page = request.args.get("page", 1, type=int)
         per_page = request.args.get("per_page", 10, type=int)
-        search = request.args.get("search", "", type=str)
+        search = request.args.get("search", "", type=str).strip()
 
-        query = User.query.filter_by(account_type="buyer")
         if search:
-            search_pattern = f"%{search}%"
-            query = query.filter(
-                (User.firstname.ilike(search_pattern)) |
-                (User.secondname.ilike(search_pattern)) |
-                (User.email.ilike(search_pattern)) |
-                (User.phone.ilike(search_pattern))
-            )
-
-        buyers = query.paginate(page=page, per_page=per_page, error_out=False)
+            # Ranked matches from the trigram search index, paged by cursor or page number
+            per_page = min(max(per_page, 1), 100)
+            try:
+                buyers, total, next_cursor, has_more = search_users(
+                    "buyer", search, limit=per_page, cursor=request.args.get("cursor"), page=page
+                )
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+
+            return jsonify({
+                "buyers": [_user_summary(b) for b in buyers],
+                "total": total,
+                "pages": (total + per_page - 1) // per_page,
+                "current_page": page,
+                "next_cursor": next_cursor,
+                "has_more": has_more
+            }), 200
+
+        buyers = User.query.filter_by(account_type="buyer").order_by(User.id).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
 
         return jsonify({
-            "buyers": [
-                {
-                    "id": b.id,
-                    "firstname": b.firstname,
-                    "secondname": b.secondname,
-                    "email": b.email,
-                    "phone": b.phone,
-                    "status": getattr(b, "status", "active"),
-                }
-                for b in buyers.items
-            ],
+            "buyers": [_user_summary(b) for b in buyers.items],
             "total": buyers.total,
             "pages": buyers.pages,
             "current_page": buyers.page
@@ -191,63 +234,28 @@ def update_buyer_status(id):
 # -------------------------
 @admin_bp.route("/sellers/orders-stats", methods=["GET"])
 def get_seller_orders_stats():
-    """Get order statistics for all sellers"""
+    """Get order statistics for all sellers, sortable and paginated"""
     if not require_admin_auth():
         return jsonify({"error": "Unauthorized - Admin access required"}), 401
 
     try:
-        # Get all sellers
-        sellers = User.query.filter_by(account_type="seller").all()
-        
-        seller_stats = []
-        for seller in sellers:
-            # Get seller's products
-            seller_products = Product.query.filter_by(seller_id=seller.id).all()
-            product_ids = [product.id for product in seller_products]
-            
-            if product_ids:
-                # Get orders for seller's products
-                pending_orders = db.session.query(Order).join(OrderItem).filter(
-                    OrderItem.product_id.in_(product_ids),
-                    Order.status.in_(['pending', 'processing', 'confirmed'])
-                ).count()
-                
-                completed_orders = db.session.query(Order).join(OrderItem).filter(
-                    OrderItem.product_id.in_(product_ids),
-                    Order.status.in_(['delivered', 'completed'])
-                ).count()
-                
-                total_orders = pending_orders + completed_orders
-                
-                # Calculate total revenue for this seller
-                total_revenue = db.session.query(
-                    func.sum(OrderItem.price * OrderItem.quantity)
-                ).join(Order).filter(
-                    OrderItem.product_id.in_(product_ids),
-                    Order.status.in_(['delivered', 'completed'])
-                ).scalar() or 0
-            else:
-                pending_orders = 0
-                completed_orders = 0
-                total_orders = 0
-                total_revenue = 0
-            
-            seller_stats.append({
-                "id": seller.id,
-                "name": f"{seller.firstname} {seller.secondname}",
-                "email": seller.email,
-                "phone": seller.phone,
-                "status": seller.status,
-                "total_products": len(seller_products),
-                "pending_orders": pending_orders,
-                "completed_orders": completed_orders,
-                "total_orders": total_orders,
-                "total_revenue": float(total_revenue)
-            })
-        
+        sort = request.args.get("sort", "total_revenue", type=str)
+        if sort not in SELLER_ORDER_SORTS:
+            return jsonify({"error": f"Invalid sort. Must be one of: {', '.join(SELLER_ORDER_SORTS)}"}), 400
+        direction = request.args.get("order", "desc", type=str)
+        if direction not in ('asc', 'desc'):
+            return jsonify({"error": "order must be 'asc' or 'desc'"}), 400
+
+        page = max(request.args.get("page", 1, type=int), 1)
+        per_page = min(max(request.args.get("per_page", 50, type=int), 1), 100)
+
+        seller_stats, total = seller_order_stats(sort, direction, page, per_page)
+
         return jsonify({
             "sellers": seller_stats,
-            "total_sellers": len(sellers)
+            "total_sellers": total,
+            "pages": (total + per_page - 1) // per_page,
+            "current_page": page
         }), 200
         
     except Exception as e:
@@ -258,7 +266,7 @@ def get_seller_orders_stats():
 # -------------------------
 @admin_bp.route("/sellers/<int:seller_id>/orders", methods=["GET"])
 def get_seller_orders(seller_id):
-    """Get detailed orders for a specific seller"""
+    """Get a page of a seller's order lines, newest first, optionally filtered by status and date"""
     if not require_admin_auth():
         return jsonify({"error": "Unauthorized - Admin access required"}), 401
 
@@ -268,48 +276,89 @@ def get_seller_orders(seller_id):
         if not seller:
             return jsonify({"error": "Seller not found"}), 404
 
-        # Get seller's products
-        seller_products = Product.query.filter_by(seller_id=seller.id).all()
-        product_ids = [product.id for product in seller_products]
-        
-        if not product_ids:
-            return jsonify({"orders": [], "seller": seller.firstname + " " + seller.secondname}), 200
-        
-        # Get orders with details
-        orders = db.session.query(Order, OrderItem, Product, User).join(
-            OrderItem, Order.id == OrderItem.order_id
-        ).join(
-            Product, OrderItem.product_id == Product.id
-        ).join(
-            User, Order.user_id == User.id
-        ).filter(
-            Product.id.in_(product_ids)
-        ).all()
-        
+        try:
+            start, end = parse_date_range(request.args)
+        except ValueError:
+            return jsonify({"error": "Dates must use the YYYY-MM-DD format"}), 400
+
+        status = request.args.get("status", "", type=str)
+        limit = min(max(request.args.get("limit", 50, type=int), 1), 200)
+        cursor = request.args.get("cursor")
+
+        # Order lines joined straight through products.seller_id, newest first
+        stmt = order_lines_query(seller_id=seller.id, start=start, end=end, status=status).add_columns(
+            Order.shipping_address_id, OrderItem.id.label('line_id')
+        ).order_by(None).order_by(Order.created_at.desc(), OrderItem.id.desc())
+
+        # Continue after the last line of the previous page
+        if cursor:
+            try:
+                stmt = stmt.where(after_cursor(Order.created_at, OrderItem.id, cursor))
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+
+        # Fetch one extra row to know whether another page exists
+        rows = db.session.execute(stmt.limit(limit + 1)).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
         order_details = []
-        for order, order_item, product, buyer in orders:
+        for (order_id, order_number, created_at, order_status, firstname, secondname, email,
+             _, _, product_name, quantity, price, shipping_address_id, _) in rows:
             order_details.append({
-                "order_id": order.id,
-                "order_number": order.order_number,
-                "buyer_name": f"{buyer.firstname} {buyer.secondname}",
-                "buyer_email": buyer.email,
-                "product_name": product.name,
-                "quantity": order_item.quantity,
-                "price": float(order_item.price),
-                "total": float(order_item.price * order_item.quantity),
-                "status": order.status,
-                "order_date": order.created_at.isoformat() if order.created_at else "N/A",
-                "shipping_address_id": order.shipping_address_id
+                "order_id": order_id,
+                "order_number": order_number,
+                "buyer_name": f"{firstname} {secondname}" if firstname else None,
+                "buyer_email": email,
+                "product_name": product_name,
+                "quantity": quantity,
+                "price": float(price),
+                "total": float(price * quantity),
+                "status": order_status,
+                "order_date": created_at.isoformat() if created_at else "N/A",
+                "shipping_address_id": shipping_address_id
             })
-        
+
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].line_id) if has_more else None
+
         return jsonify({
             "orders": order_details,
-            "seller": f"{seller.firstname} {seller.secondname}"
+            "seller": f"{seller.firstname} {seller.secondname}",
+            "next_cursor": next_cursor,
+            "has_more": has_more
         }), 200
         
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
+# -------------------------
+# GET order lines export
+# -------------------------
+@admin_bp.route("/orders/export", methods=["GET"])
+def export_orders():
+    """Stream order lines for the whole platform, or one seller, as CSV or NDJSON"""
+    if not require_admin_auth():
+        return jsonify({"error": "Unauthorized - Admin access required"}), 401
+
+    try:
+        fmt = request.args.get("format", "csv", type=str)
+        if fmt not in EXPORT_FORMATS:
+            return jsonify({"error": f"Invalid format. Must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+        try:
+            start, end = parse_date_range(request.args)
+        except ValueError:
+            return jsonify({"error": "Dates must use the YYYY-MM-DD format"}), 400
+
+        seller_id = request.args.get("seller_id", type=int)
+        status = request.args.get("status", "", type=str)
+        stmt = order_lines_query(seller_id=seller_id, start=start, end=end, status=status)
+        filename = f"seller-{seller_id}-orders" if seller_id else "orders"
+        return stream_order_lines(stmt, fmt, filename)
+
+    except Exception as e:
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
 # -------------------------
 # GET analytics data
 # -------------------------
@@ -320,149 +369,7 @@ def get_analytics_dashboard():
         return jsonify({"error": "Unauthorized - Admin access required"}), 401
 
     try:
-        from datetime import datetime, timedelta
-        
-        # Calculate date ranges
-        now = datetime.now()
-        current_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        last_month_start = (current_month_start - timedelta(days=1)).replace(day=1)
-        last_month_end = current_month_start - timedelta(days=1)
-        
-        # Current month data
-        current_month_orders = Order.query.filter(Order.created_at >= current_month_start).all()
-        current_month_revenue = db.session.query(
-            func.sum(OrderItem.price * OrderItem.quantity)
-        ).join(Order).filter(Order.created_at >= current_month_start).scalar() or 0
-        
-        # Last month data for comparison
-        last_month_orders = Order.query.filter(
-            Order.created_at >= last_month_start,
-            Order.created_at <= last_month_end
-        ).all()
-        last_month_revenue = db.session.query(
-            func.sum(OrderItem.price * OrderItem.quantity)
-        ).join(Order).filter(
-            Order.created_at >= last_month_start,
-            Order.created_at <= last_month_end
-        ).scalar() or 0
-        
-        # Calculate growth percentages
-        def calculate_growth(current, previous):
-            if previous == 0:
-                return 100.0 if current > 0 else 0.0
-            return round(((current - previous) / previous) * 100, 1)
-        
-        current_orders_count = len(current_month_orders)
-        last_orders_count = len(last_month_orders)
-        
-        # Active users (users who made orders this month)
-        current_active_users = db.session.query(User.id).join(Order).filter(
-            Order.created_at >= current_month_start
-        ).distinct().count()
-        
-        last_active_users = db.session.query(User.id).join(Order).filter(
-            Order.created_at >= last_month_start,
-            Order.created_at <= last_month_end
-        ).distinct().count()
-        
-        # Monthly data for the last 12 months
-        monthly_data = []
-        for i in range(12):
-            month_start = (now.replace(day=1) - timedelta(days=31*i)).replace(day=1)
-            next_month = (month_start.replace(day=28) + timedelta(days=4)).replace(day=1)
-            
-            month_orders = Order.query.filter(
-                Order.created_at >= month_start,
-                Order.created_at < next_month
-            ).count()
-            
-            month_revenue = db.session.query(
-                func.sum(OrderItem.price * OrderItem.quantity)
-            ).join(Order).filter(
-                Order.created_at >= month_start,
-                Order.created_at < next_month
-            ).scalar() or 0
-            
-            month_users = db.session.query(User.id).join(Order).filter(
-                Order.created_at >= month_start,
-                Order.created_at < next_month
-            ).distinct().count()
-            
-            monthly_data.append({
-                "month": month_start.strftime("%b"),
-                "orders": month_orders,
-                "revenue": float(month_revenue),
-                "users": month_users
-            })
-        
-        monthly_data.reverse()  # Show oldest to newest
-        
-        # Top products
-        top_products = db.session.query(
-            Product.name,
-            func.sum(OrderItem.quantity).label('total_sold'),
-            func.sum(OrderItem.price * OrderItem.quantity).label('total_revenue')
-        ).join(OrderItem).join(Order).filter(
-            Order.created_at >= current_month_start
-        ).group_by(Product.id, Product.name).order_by(
-            func.sum(OrderItem.quantity).desc()
-        ).limit(5).all()
-        
-        # Order status distribution
-        order_statuses = db.session.query(
-            Order.status,
-            func.count(Order.id).label('count')
-        ).filter(Order.created_at >= current_month_start).group_by(Order.status).all()
-        
-        # Calculate conversion rate (orders/active users)
-        current_conversion = round((current_orders_count / current_active_users * 100), 1) if current_active_users > 0 else 0
-        last_conversion = round((last_orders_count / last_active_users * 100), 1) if last_active_users > 0 else 0
-        
-        return jsonify({
-            "metrics": {
-                "total_sales": {
-                    "current": current_orders_count,
-                    "previous": last_orders_count,
-                    "change": calculate_growth(current_orders_count, last_orders_count),
-                    "data": [month["orders"] for month in monthly_data]
-                },
-                "active_users": {
-                    "current": current_active_users,
-                    "previous": last_active_users,
-                    "change": calculate_growth(current_active_users, last_active_users),
-                    "data": [month["users"] for month in monthly_data]
-                },
-                "revenue": {
-                    "current": float(current_month_revenue),
-                    "previous": float(last_month_revenue),
-                    "change": calculate_growth(current_month_revenue, last_month_revenue),
-                    "data": [month["revenue"] for month in monthly_data]
-                },
-                "conversion_rate": {
-                    "current": current_conversion,
-                    "previous": last_conversion,
-                    "change": calculate_growth(current_conversion, last_conversion),
-                    "data": [round((monthly_data[i]["orders"] / monthly_data[i]["users"] * 100), 1) if monthly_data[i]["users"] > 0 else 0 for i in range(12)]
-                }
-            },
-            "monthly_data": monthly_data,
-            "top_products": [
-                {
-                    "name": product.name,
-                    "sales": int(product.total_sold),
-                    "revenue": float(product.total_revenue)
-                }
-                for product in top_products
-            ],
-            "order_statuses": [
-                {
-                    "status": status.status,
-                    "count": status.count,
-                    "percentage": round((status.count / current_orders_count * 100), 1) if current_orders_count > 0 else 0
-                }
-                for status in order_statuses
-            ]
-        }), 200
+        return jsonify(build_platform_analytics()), 200
         
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
@@ -478,186 +385,7 @@ def get_earnings_dashboard():
         return jsonify({"error": "Unauthorized - Admin access required"}), 401
 
     try:
-        from datetime import datetime, timedelta
-        
-        # Calculate date ranges
-        now = datetime.now()
-        current_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        last_month_start = (current_month_start - timedelta(days=1)).replace(day=1)
-        last_month_end = current_month_start - timedelta(days=1)
-        
-        # Platform fee rate (assuming 15% fee)
-        PLATFORM_FEE_RATE = 0.15
-        
-        # Current month earnings
-        current_month_revenue = db.session.query(
-            func.sum(OrderItem.price * OrderItem.quantity)
-        ).join(Order).filter(Order.created_at >= current_month_start).scalar() or 0
-        
-        current_month_platform_fees = current_month_revenue * PLATFORM_FEE_RATE
-        current_month_seller_payouts = current_month_revenue - current_month_platform_fees
-        
-        # Last month earnings for comparison
-        last_month_revenue = db.session.query(
-            func.sum(OrderItem.price * OrderItem.quantity)
-        ).join(Order).filter(
-            Order.created_at >= last_month_start,
-            Order.created_at <= last_month_end
-        ).scalar() or 0
-        
-        last_month_platform_fees = last_month_revenue * PLATFORM_FEE_RATE
-        last_month_seller_payouts = last_month_revenue - last_month_platform_fees
-        
-        # Calculate growth percentages
-        def calculate_growth(current, previous):
-            if previous == 0:
-                return 100.0 if current > 0 else 0.0
-            return round(((current - previous) / previous) * 100, 1)
-        
-        # Transaction counts
-        current_month_transactions = Order.query.filter(Order.created_at >= current_month_start).count()
-        last_month_transactions = Order.query.filter(
-            Order.created_at >= last_month_start,
-            Order.created_at <= last_month_end
-        ).count()
-        
-        # Average transaction value
-        avg_transaction = current_month_revenue / current_month_transactions if current_month_transactions > 0 else 0
-        
-        # Monthly data for the last 12 months
-        monthly_data = []
-        for i in range(12):
-            month_start = (now.replace(day=1) - timedelta(days=31*i)).replace(day=1)
-            next_month = (month_start.replace(day=28) + timedelta(days=4)).replace(day=1)
-            
-            month_revenue = db.session.query(
-                func.sum(OrderItem.price * OrderItem.quantity)
-            ).join(Order).filter(
-                Order.created_at >= month_start,
-                Order.created_at < next_month
-            ).scalar() or 0
-            
-            month_fees = month_revenue * PLATFORM_FEE_RATE
-            month_payouts = month_revenue - month_fees
-            
-            monthly_data.append({
-                "month": month_start.strftime("%b"),
-                "earnings": float(month_revenue),
-                "fees": float(month_fees),
-                "payouts": float(month_payouts)
-            })
-        
-        monthly_data.reverse()  # Show oldest to newest
-        
-        # Top earning sellers this month
-        top_sellers = db.session.query(
-            User.firstname,
-            User.secondname,
-            func.sum(OrderItem.price * OrderItem.quantity).label('total_earnings'),
-            func.count(func.distinct(Order.id)).label('total_orders')
-        ).join(Product, Product.seller_id == User.id).join(OrderItem).join(Order).filter(
-            Order.created_at >= current_month_start
-        ).group_by(User.id, User.firstname, User.secondname).order_by(
-            func.sum(OrderItem.price * OrderItem.quantity).desc()
-        ).limit(5).all()
-        
-        # Calculate payout amounts based on order status
-        completed_payout_revenue = db.session.query(
-            func.sum(OrderItem.price * OrderItem.quantity)
-        ).join(Order).filter(
-            Order.created_at >= current_month_start,
-            Order.status.in_(['delivered', 'completed'])
-        ).scalar() or 0
-        
-        pending_payout_revenue = db.session.query(
-            func.sum(OrderItem.price * OrderItem.quantity)
-        ).join(Order).filter(
-            Order.created_at >= current_month_start,
-            Order.status.in_(['pending', 'processing', 'shipped'])
-        ).scalar() or 0
-        
-        completed_payouts = completed_payout_revenue * (1 - PLATFORM_FEE_RATE)
-        pending_payouts = pending_payout_revenue * (1 - PLATFORM_FEE_RATE)
-        
-        # Recent payouts (simulated data based on recent orders)
-        recent_orders = db.session.query(
-            Order.id,
-            User.firstname,
-            User.secondname,
-            Order.created_at,
-            func.sum(OrderItem.price * OrderItem.quantity).label('order_total'),
-            Order.status
-        ).join(OrderItem).join(Product).join(User, Product.seller_id == User.id).filter(
-            Order.created_at >= (now - timedelta(days=30))
-        ).group_by(Order.id, User.firstname, User.secondname, Order.created_at, Order.status).order_by(
-            Order.created_at.desc()
-        ).limit(5).all()
-        
-        recent_payouts = []
-        for order in recent_orders:
-            payout_amount = order.order_total * (1 - PLATFORM_FEE_RATE)
-            status = 'completed' if order.status in ['delivered', 'completed'] else 'pending'
-            recent_payouts.append({
-                "id": f"PAY-{order.id:04d}",
-                "seller": f"{order.firstname} {order.secondname}",
-                "date": order.created_at.strftime("%Y-%m-%d"),
-                "amount": float(payout_amount),
-                "status": status
-            })
-        
-        # Calculate performance metrics
-        completed_orders = Order.query.filter(
-            Order.created_at >= current_month_start,
-            Order.status.in_(['delivered', 'completed'])
-        ).count()
-        
-        payout_completion_rate = (completed_orders / current_month_transactions * 100) if current_month_transactions > 0 else 0
-        
-        return jsonify({
-            "metrics": {
-                "total_earnings": {
-                    "current": float(current_month_revenue),
-                    "previous": float(last_month_revenue),
-                    "change": calculate_growth(current_month_revenue, last_month_revenue),
-                    "growth_rate": calculate_growth(current_month_revenue, last_month_revenue)
-                },
-                "platform_fees": {
-                    "current": float(current_month_platform_fees),
-                    "previous": float(last_month_platform_fees),
-                    "percentage": PLATFORM_FEE_RATE * 100
-                },
-                "seller_payouts": {
-                    "current": float(current_month_seller_payouts),
-                    "previous": float(last_month_seller_payouts),
-                    "transactions": current_month_transactions
-                },
-                "average_transaction": {
-                    "current": float(avg_transaction),
-                    "transactions": current_month_transactions
-                },
-                "payout_distribution": {
-                    "completed": float(completed_payouts),
-                    "pending": float(pending_payouts),
-                    "completion_rate": round(payout_completion_rate, 1)
-                }
-            },
-            "chart_data": monthly_data,
-            "top_sellers": [
-                {
-                    "name": f"{seller.firstname} {seller.secondname}",
-                    "earnings": float(seller.total_earnings * (1 - PLATFORM_FEE_RATE)),
-                    "sales": int(seller.total_orders),
-                    "revenue": float(seller.total_earnings)
-                }
-                for seller in top_sellers
-            ],
-            "recent_payouts": recent_payouts,
-            "platform_stats": {
-                "fee_rate": PLATFORM_FEE_RATE * 100,
-                "payout_completion": round(payout_completion_rate, 1),
-                "dispute_rate": 2.1  # Placeholder - would come from dispute tracking system
-            }
-        }), 200
+        return jsonify(build_platform_earnings()), 200
         
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
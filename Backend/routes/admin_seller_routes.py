@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, session
 from app import db
 from app.models import User
+from utils.user_search import search_users
 
 admin_seller_bp = Blueprint("admin_seller", __name__)
 
@@ -14,6 +15,16 @@ def require_admin_auth():
         return False
     return True
 
+def _user_summary(user):
+    return {
+        "id": user.id,
+        "firstname": user.firstname,
+        "secondname": user.secondname,
+        "email": user.email,
+        "phone": user.phone,
+        "status": getattr(user, "status", "active"),
+    }
+
 # -------------------------
 # GET all sellers
 # -------------------------
@@ -26,32 +37,33 @@ def get_sellers():
     try:
         page = request.args.get("page", 1, type=int)
         per_page = request.args.get("per_page", 10, type=int)
-        search = request.args.get("search", "", type=str)
+        search = request.args.get("search", "", type=str).strip()
 
-        query = User.query.filter_by(account_type="seller")
         if search:
-            search_pattern = f"%{search}%"
-            query = query.filter(
-                (User.firstname.ilike(search_pattern)) |
-                (User.secondname.ilike(search_pattern)) |
-                (User.email.ilike(search_pattern)) |
-                (User.phone.ilike(search_pattern))
-            )
-
-        sellers = query.paginate(page=page, per_page=per_page, error_out=False)
+            # Ranked matches from the trigram search index, paged by cursor or page number
+            per_page = min(max(per_page, 1), 100)
+            try:
+                sellers, total, next_cursor, has_more = search_users(
+                    "seller", search, limit=per_page, cursor=request.args.get("cursor"), page=page
+                )
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+
+            return jsonify({
+                "sellers": [_user_summary(s) for s in sellers],
+                "total": total,
+                "pages": (total + per_page - 1) // per_page,
+                "current_page": page,
+                "next_cursor": next_cursor,
+                "has_more": has_more
+            }), 200
+
+        sellers = User.query.filter_by(account_type="seller").order_by(User.id).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
 
         return jsonify({
-            "sellers": [
-                {
-                    "id": s.id,
-                    "firstname": s.firstname,
-                    "secondname": s.secondname,
-                    "email": s.email,
-                    "phone": s.phone,
-                    "status": getattr(s, "status", "active"),
-                }
-                for s in sellers.items
-            ],
+            "sellers": [_user_summary(s) for s in sellers.items],
             "total": sellers.total,
             "pages": sellers.pages,
             "current_page": sellers.page
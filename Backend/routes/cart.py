@@ -0,0 +1,164 @@
+from flask import Blueprint, request, jsonify, session
+from app import db
+from app.models import CartItem, Product
+from utils.cart import get_cart, find_line, merge_cart_lines, revalidate_cart
+
+cart_bp = Blueprint('cart', __name__)
+
+def check_auth():
+    """Helper function to check authentication"""
+    if not session.get('user_id'):
+        return None
+    return session['user_id']
+
+def cart_response(cart, status_code=200):
+    """Revalidate the cart, persist refreshed price snapshots and return it"""
+    validation, _ = revalidate_cart(cart)
+    db.session.commit()
+    return jsonify({"cart": validation}), status_code
+
+@cart_bp.route('/cart', methods=['GET'])
+def get_cart_view():
+    """Get the current user's cart, revalidated against current prices and stock"""
+    try:
+        current_user_id = check_auth()
+        if not current_user_id:
+            return jsonify({"error": "Not authenticated"}), 401
+
+        cart = get_cart(current_user_id)
+        return cart_response(cart)
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+@cart_bp.route('/cart', methods=['DELETE'])
+def clear_cart():
+    """Remove every line from the current user's cart"""
+    try:
+        current_user_id = check_auth()
+        if not current_user_id:
+            return jsonify({"error": "Not authenticated"}), 401
+
+        cart = get_cart(current_user_id)
+        if cart:
+            cart.items.clear()
+            db.session.commit()
+
+        return jsonify({"message": "Cart cleared"}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+@cart_bp.route('/cart/items', methods=['POST'])
+def add_cart_item():
+    """Add a product to the cart, or increase the quantity of an existing line"""
+    try:
+        current_user_id = check_auth()
+        if not current_user_id:
+            return jsonify({"error": "Not authenticated"}), 401
+
+        data = request.get_json() or {}
+        product_id = data.get('product_id')
+        quantity = data.get('quantity', 1)
+        if not product_id or not isinstance(quantity, int) or quantity < 1:
+            return jsonify({"error": "product_id and a positive quantity are required"}), 400
+
+        product = Product.query.get(product_id)
+        if not product:
+            return jsonify({"error": "Product not found"}), 404
+
+        cart = get_cart(current_user_id, create=True)
+        line = find_line(cart, product.id, data.get('color'), data.get('size'))
+        if line:
+            line.quantity += quantity
+        else:
+            cart.items.append(CartItem(
+                product_id=product.id,
+                quantity=quantity,
+                unit_price=product.price,
+                color=data.get('color'),
+                size=data.get('size')
+            ))
+
+        return cart_response(cart, 201)
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+@cart_bp.route('/cart/items/<int:item_id>', methods=['PATCH'])
+def update_cart_item(item_id):
+    """Change the quantity of a cart line; a quantity of 0 removes it"""
+    try:
+        current_user_id = check_auth()
+        if not current_user_id:
+            return jsonify({"error": "Not authenticated"}), 401
+
+        data = request.get_json() or {}
+        quantity = data.get('quantity')
+        if not isinstance(quantity, int) or quantity < 0:
+            return jsonify({"error": "quantity must be a non-negative integer"}), 400
+
+        cart = get_cart(current_user_id)
+        line = next((item for item in cart.items if item.id == item_id), None) if cart else None
+        if not line:
+            return jsonify({"error": "Cart item not found"}), 404
+
+        if quantity == 0:
+            cart.items.remove(line)
+        else:
+            line.quantity = quantity
+
+        return cart_response(cart)
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+@cart_bp.route('/cart/items/<int:item_id>', methods=['DELETE'])
+def remove_cart_item(item_id):
+    """Remove a line from the cart"""
+    try:
+        current_user_id = check_auth()
+        if not current_user_id:
+            return jsonify({"error": "Not authenticated"}), 401
+
+        cart = get_cart(current_user_id)
+        line = next((item for item in cart.items if item.id == item_id), None) if cart else None
+        if not line:
+            return jsonify({"error": "Cart item not found"}), 404
+
+        cart.items.remove(line)
+        return cart_response(cart)
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+@cart_bp.route('/cart/merge', methods=['POST'])
+def merge_cart():
+    """Merge the guest cart kept by the frontend into the server cart after login"""
+    try:
+        current_user_id = check_auth()
+        if not current_user_id:
+            return jsonify({"error": "Not authenticated"}), 401
+
+        data = request.get_json() or {}
+        lines = data.get('items', [])
+        if not isinstance(lines, list):
+            return jsonify({"error": "items must be a list"}), 400
+
+        cart = get_cart(current_user_id, create=True)
+        try:
+            merge_cart_lines(cart, lines)
+        except (TypeError, ValueError):
+            db.session.rollback()
+            return jsonify({"error": "Each item needs a numeric product id and quantity"}), 400
+
+        return cart_response(cart)
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
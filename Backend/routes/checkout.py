@@ -1,18 +1,19 @@
 from flask import Blueprint, request, jsonify, session
 from app import db
 from app.models import Order, OrderItem, Address, Payment, User, Product, Notification
+from utils.pagination import encode_cursor, after_cursor
+from utils.order_numbers import generate_order_number
+from utils.order_events import record_order_created
+from utils.payments import submit_payment
+from utils.rollups import rollup_new_orders, record_seller_buyers
+from utils.cache import invalidate_seller
+from utils.cart import get_cart, revalidate_cart
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 from datetime import datetime
-import random
-import string
 
 checkout_bp = Blueprint('checkout', __name__)
 
-def generate_order_number():
-    """Generate a unique order number"""
-    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-    random_str = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-    return f"ORD-{timestamp}-{random_str}"
-
 def check_auth():
     """Helper function to check authentication"""
     if not session.get('user_id'):
@@ -27,13 +28,35 @@ def create_order():
             return jsonify({"error": "Not authenticated"}), 401
             
         data = request.get_json()
+        use_cart = data.get('use_cart', False)
         
         # Validate required fields
-        if not data.get('items') or not data.get('shipping_info'):
+        if (not use_cart and not data.get('items')) or not data.get('shipping_info'):
             return jsonify({"error": "Missing required fields"}), 400
         
+        cart = None
+        products = None
+        if use_cart:
+            # Check out the server-side cart; prices and stock are checked in one query
+            cart = get_cart(current_user_id)
+            validation, products = revalidate_cart(cart, refresh_snapshots=False)
+            if not validation['valid']:
+                return jsonify({"error": "Cart has changed, please review it before checkout", "cart": validation}), 409
+            items = [
+                {
+                    'id': line['product_id'],
+                    'price': line['unit_price'],
+                    'quantity': line['quantity'],
+                    'color': line['color'],
+                    'size': line['size']
+                }
+                for line in validation['items']
+            ]
+        else:
+            items = data['items']
+        
         # Calculate totals
-        subtotal = sum(item['price'] * item['quantity'] for item in data['items'])
+        subtotal = sum(item['price'] * item['quantity'] for item in items)
         tax = data.get('tax', subtotal * 0.08)
         shipping = data.get('shipping', 0 if subtotal > 100 else 15)
         total = subtotal + tax + shipping
@@ -69,9 +92,10 @@ def create_order():
         )
         db.session.add(order)
         db.session.flush()
+        record_order_created(order, actor_id=current_user_id)
         
         # Create order items
-        for item_data in data['items']:
+        for item_data in items:
             item = OrderItem(
                 order_id=order.id,
                 product_id=item_data['id'],
@@ -102,15 +126,19 @@ def create_order():
         payment = Payment(**payment_data)
         db.session.add(payment)
         
-        # Commit all changes
-        db.session.commit()
+        # The order, its notifications and its rollup deltas commit together below
+        db.session.flush()
         
         # Create notifications for sellers
         sellers_notified = set()  # Track unique sellers to avoid duplicate notifications
         buyer = User.query.get(current_user_id)
         
-        for item_data in data['items']:
-            product = Product.query.get(item_data['id'])
+        if products is None:
+            product_ids = {item_data['id'] for item_data in items}
+            products = {p.id: p for p in Product.query.filter(Product.id.in_(product_ids)).all()}
+        
+        for item_data in items:
+            product = products.get(item_data['id'])
             if product and product.seller_id not in sellers_notified:
                 notification = Notification(
                     title="New Order Received!",
@@ -124,34 +152,16 @@ def create_order():
                 db.session.add(notification)
                 sellers_notified.add(product.seller_id)
         
-        # Simulate payment processing
-        payment.status = 'completed'
-        order.status = 'processing'
+        # The cart has been turned into an order
+        if cart:
+            cart.items.clear()
+        rollup_new_orders([order.id])
+        record_seller_buyers(current_user_id, sellers_notified, order.created_at)
         db.session.commit()
+        invalidate_seller(sellers_notified, 'order_stats', 'dashboard')
         
-        # Store order in session for immediate access
-        if 'user_orders' not in session:
-            session['user_orders'] = {}
-        
-        user_orders = session['user_orders']
-        if str(current_user_id) not in user_orders:
-            user_orders[str(current_user_id)] = []
-        
-        user_orders[str(current_user_id)].append({
-            'id': order.order_number,
-            'date': order.created_at.isoformat(),
-            'status': order.status,
-            'items': data['items'],
-            'subtotal': subtotal,
-            'tax': tax,
-            'shipping': shipping,
-            'total': total,
-            'paymentMethod': data['payment_method'],
-            'shippingInfo': shipping_info
-        })
-        
-        session['user_orders'] = user_orders
-        session.modified = True
+        # Payment runs in the background; the order moves to processing once the gateway confirms it
+        submit_payment(payment.id)
         
         return jsonify({
             "message": "Order created successfully",
@@ -165,28 +175,69 @@ def create_order():
 
 @checkout_bp.route('/orders/<int:user_id>', methods=['GET'])
 def get_user_orders(user_id):
+    """Get a page of the buyer's order history, newest first"""
     try:
         current_user_id = check_auth()
         if not current_user_id or current_user_id != user_id:
             return jsonify({"error": "Not authenticated"}), 401
-            
-        # First check session for orders
-        user_orders = session.get('user_orders', {}).get(str(user_id), [])
-        
-        # If no orders in session, check database
-        if not user_orders:
-            orders = Order.query.filter_by(user_id=user_id).order_by(Order.created_at.desc()).all()
-            user_orders = [order.to_dict() for order in orders]
-            
-            # Store in session for future requests
-            if 'user_orders' not in session:
-                session['user_orders'] = {}
-            session['user_orders'][str(user_id)] = user_orders
-            session.modified = True
-        
+
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        cursor = request.args.get('cursor')
+        summary = request.args.get('summary', 'false').lower() == 'true'
+
+        query = Order.query.filter_by(user_id=user_id)
+
+        # Continue after the last order of the previous page
+        if cursor:
+            try:
+                query = query.filter(after_cursor(Order.created_at, Order.id, cursor))
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+
+        # Load every relationship used by to_dict() in one query each
+        if not summary:
+            query = query.options(
+                selectinload(Order.shipping_address),
+                selectinload(Order.payment),
+                selectinload(Order.items).selectinload(OrderItem.product)
+            )
+
+        # Fetch one extra row to know whether another page exists
+        orders = query.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit + 1).all()
+        has_more = len(orders) > limit
+        orders = orders[:limit]
+
+        next_cursor = None
+        if has_more:
+            last = orders[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
         return jsonify({
-            "orders": user_orders
+            "orders": [order.to_summary_dict() if summary else order.to_dict() for order in orders],
+            "next_cursor": next_cursor,
+            "has_more": has_more
         }), 200
-        
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@checkout_bp.route('/orders/<int:user_id>/totals', methods=['GET'])
+def get_user_order_totals(user_id):
+    """Order count and amount spent over the buyer's whole history, without loading the orders"""
+    try:
+        current_user_id = check_auth()
+        if not current_user_id or current_user_id != user_id:
+            return jsonify({"error": "Not authenticated"}), 401
+
+        total_orders, total_spent = db.session.query(
+            func.count(Order.id), func.coalesce(func.sum(Order.total), 0)
+        ).filter(Order.user_id == user_id).one()
+
+        return jsonify({
+            "total_orders": total_orders,
+            "total_spent": float(total_spent)
+        }), 200
+
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
@@ -4,6 +4,7 @@ from flask_cors import CORS
 from datetime import datetime
 from app import db
 from app.models import Notification, User
+from utils.cache import invalidate_seller
 
 notifications_bp = Blueprint("notifications_bp", __name__)
 CORS(
@@ -48,6 +49,8 @@ def create_notification():
     )
     db.session.add(new_notification)
     db.session.commit()
+    if new_notification.target_user:
+        invalidate_seller([new_notification.target_user], 'dashboard')
 
     return jsonify(new_notification.to_dict()), 201
 
@@ -62,6 +65,8 @@ def delete_notification(notification_id):
 
     db.session.delete(notif)
     db.session.commit()
+    if notif.target_user:
+        invalidate_seller([notif.target_user], 'dashboard')
     return jsonify({"message": "Notification deleted"}), 200
 
 # ===============================
@@ -83,6 +88,8 @@ def admin_create_notification():
     )
     db.session.add(new_notification)
     db.session.commit()
+    if new_notification.target_user:
+        invalidate_seller([new_notification.target_user], 'dashboard')
 
     return jsonify(new_notification.to_dict()), 201
 
@@ -154,6 +161,8 @@ def admin_delete_notification(notification_id):
 
     db.session.delete(notif)
     db.session.commit()
+    if notif.target_user:
+        invalidate_seller([notif.target_user], 'dashboard')
     return jsonify({"message": "Notification deleted"}), 200
 
 
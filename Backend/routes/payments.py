@@ -0,0 +1,33 @@
+from flask import Blueprint, request, jsonify
+from app import db
+from app.config import Config
+from utils.payments import GATEWAYS, get_gateway, handle_callback
+
+payments_bp = Blueprint('payments', __name__)
+
+@payments_bp.route('/payments/callback/<gateway_name>', methods=['POST'])
+def payment_callback(gateway_name):
+    """Webhook called by a payment provider once a payment succeeds or fails"""
+    try:
+        if gateway_name not in GATEWAYS:
+            return jsonify({"error": "Unknown payment gateway"}), 404
+
+        if not Config.PAYMENT_WEBHOOK_SECRET:
+            return jsonify({"error": "Payment callbacks are not configured"}), 503
+
+        gateway = get_gateway(gateway_name)
+        if not gateway.verify_signature(request.get_data(), request.headers.get('X-Signature')):
+            return jsonify({"error": "Invalid signature"}), 401
+
+        payload = request.get_json(silent=True) or {}
+        if not payload.get('reference') or not payload.get('status'):
+            return jsonify({"error": "reference and status are required"}), 400
+
+        if not handle_callback(gateway_name, payload):
+            return jsonify({"error": "Payment not found"}), 404
+
+        return jsonify({"received": True}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
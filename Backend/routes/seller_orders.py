@@ -1,11 +1,64 @@
 from flask import Blueprint, request, jsonify, session
 from app import db
-from app.models import Order, OrderItem, User, Product, Notification
-from sqlalchemy import and_
-from datetime import datetime
+from app.config import Config
+from app.models import Order, OrderItem, User, Product, Notification, SellerDailyStat
+from sqlalchemy import and_, update, func
+from sqlalchemy.orm import joinedload, contains_eager
+from utils.order_events import record_status_changes
+from utils.rollups import rollup_status_changes
+from utils.cache import seller_key, get_or_compute, invalidate_seller
+from utils.seller_reports import (
+    SELLER_REPORTS, REPORT_BUILDERS, PRODUCT_SORTS, SellerAggregates,
+    build_dashboard, build_analytics, build_earnings, product_performance
+)
+from utils.exports import EXPORT_FORMATS, parse_date_range, order_lines_query, stream_order_lines
+from datetime import datetime, timedelta
 
 seller_orders_bp = Blueprint('seller_orders', __name__)
 
+VALID_STATUSES = ['pending', 'processing', 'shipped', 'delivered', 'cancelled']
+
+# Statuses a seller may move an order to from its current status. Pending orders
+# reach processing only through the payment stage, once their payment is confirmed
+ALLOWED_TRANSITIONS = {
+    'pending': ['cancelled'],
+    'processing': ['shipped', 'cancelled'],
+    'shipped': ['delivered'],
+    'delivered': [],
+    'cancelled': []
+}
+
+MAX_BULK_ORDERS = 500
+
+def can_transition(current_status, new_status):
+    """Whether ALLOWED_TRANSITIONS lets an order move from current_status to new_status"""
+    return new_status in ALLOWED_TRANSITIONS.get(current_status, [])
+
+def transition_orders(current_statuses, new_status, actor_id):
+    """
+    Move orders to new_status, given {order_id: current status} for orders already
+    checked with can_transition(). One UPDATE per current status, guarded by that
+    status, so orders changed by a concurrent request are skipped and every update
+    knows exactly which status it replaced. Records the status events and moves the
+    rollups; the caller commits. Returns (updated order ids, affected seller ids).
+    """
+    by_status = {}
+    for order_id, status in current_statuses.items():
+        by_status.setdefault(status, []).append(order_id)
+
+    changes = []
+    for status, order_ids in by_status.items():
+        updated = db.session.execute(
+            update(Order)
+            .where(Order.id.in_(order_ids), Order.status == status)
+            .values(status=new_status, updated_at=datetime.utcnow())
+            .returning(Order.id)
+        ).scalars()
+        changes.extend((order_id, status) for order_id in updated)
+
+    record_status_changes(changes, new_status, actor_id=actor_id)
+    return {order_id for order_id, _ in changes}, rollup_status_changes(changes, new_status)
+
 def require_seller_auth():
     """Check if user is authenticated and is a seller"""
     user_id = session.get('user_id')
@@ -23,27 +76,46 @@ def get_seller_orders():
         if not is_auth:
             return jsonify({"error": "Unauthorized - Seller access required"}), 401
         
-        page = request.args.get("page", 1, type=int)
-        per_page = request.args.get("per_page", 10, type=int)
+        page = max(request.args.get("page", 1, type=int), 1)
+        per_page = min(max(request.args.get("per_page", 10, type=int), 1), 100)
         status = request.args.get("status", "", type=str)
         
-        # Get all orders that contain products from this seller
-        query = db.session.query(Order).join(OrderItem).join(Product).filter(
+        # Distinct ids of the orders that contain products from this seller
+        order_ids = db.session.query(Order.id).join(OrderItem).join(Product).filter(
             Product.seller_id == seller_id
         )
         
         if status:
-            query = query.filter(Order.status == status)
-        
-        # Order by most recent first
-        query = query.order_by(Order.created_at.desc())
-        
-        orders = query.paginate(page=page, per_page=per_page, error_out=False)
+            order_ids = order_ids.filter(Order.status == status)
+        
+        order_ids = order_ids.distinct().subquery()
+        total = db.session.query(func.count()).select_from(order_ids).scalar()
+        
+        # One page of orders, most recent first, with buyer and address loaded in the same query
+        orders = Order.query.options(
+            joinedload(Order.user),
+            joinedload(Order.shipping_address)
+        ).filter(
+            Order.id.in_(db.session.query(order_ids.c.id))
+        ).order_by(
+            Order.created_at.desc(), Order.id.desc()
+        ).offset((page - 1) * per_page).limit(per_page).all()
+        
+        # Only this seller's items on the page, with their products, in one query
+        seller_items_by_order = {}
+        if orders:
+            seller_items = OrderItem.query.join(Product).options(
+                contains_eager(OrderItem.product)
+            ).filter(
+                OrderItem.order_id.in_([order.id for order in orders]),
+                Product.seller_id == seller_id
+            ).order_by(OrderItem.id).all()
+            for item in seller_items:
+                seller_items_by_order.setdefault(item.order_id, []).append(item)
         
         order_list = []
-        for order in orders.items:
-            # Get only the items from this seller
-            seller_items = [item for item in order.items if item.product.seller_id == seller_id]
+        for order in orders:
+            seller_items = seller_items_by_order.get(order.id, [])
             
             # Calculate seller's portion of the order
             seller_subtotal = sum(item.price * item.quantity for item in seller_items)
@@ -55,7 +127,7 @@ def get_seller_orders():
                     "id": order.user.id,
                     "name": f"{order.user.firstname} {order.user.secondname}",
                     "email": order.user.email
-                },
+                } if order.user else None,
                 "status": order.status,
                 "seller_items": [item.to_dict() for item in seller_items],
                 "seller_subtotal": seller_subtotal,
@@ -67,9 +139,9 @@ def get_seller_orders():
         
         return jsonify({
             "orders": order_list,
-            "total": orders.total,
-            "pages": orders.pages,
-            "current_page": orders.page
+            "total": total,
+            "pages": (total + per_page - 1) // per_page,
+            "current_page": page
         }), 200
         
     except Exception as e:
@@ -88,10 +160,9 @@ def update_order_status(order_id):
             return jsonify({"error": "Status field required"}), 400
         
         new_status = data['status']
-        valid_statuses = ['pending', 'processing', 'shipped', 'delivered', 'cancelled']
         
-        if new_status not in valid_statuses:
-            return jsonify({"error": f"Invalid status. Must be one of: {', '.join(valid_statuses)}"}), 400
+        if new_status not in VALID_STATUSES:
+            return jsonify({"error": f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}"}), 400
         
         # Check if the order contains products from this seller
         order = db.session.query(Order).join(OrderItem).join(Product).filter(
@@ -101,11 +172,17 @@ def update_order_status(order_id):
         if not order:
             return jsonify({"error": "Order not found or you don't have permission to update it"}), 404
         
-        # Update order status
-        order.status = new_status
-        order.updated_at = datetime.utcnow()
-        
-        db.session.commit()
+        if order.status != new_status:
+            if not can_transition(order.status, new_status):
+                return jsonify({"error": f"Cannot change status from {order.status} to {new_status}"}), 409
+            
+            updated_ids, affected_sellers = transition_orders({order.id: order.status}, new_status, seller_id)
+            if not updated_ids:
+                db.session.rollback()
+                return jsonify({"error": "Order status was changed by another request"}), 409
+            
+            db.session.commit()
+            invalidate_seller(affected_sellers, 'order_stats', 'dashboard')
         
         return jsonify({
             "message": f"Order status updated to {new_status}",
@@ -117,33 +194,142 @@ def update_order_status(order_id):
         db.session.rollback()
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
-@seller_orders_bp.route('/seller/orders/stats', methods=['GET'])
-def get_seller_order_stats():
-    """Get order statistics for the seller"""
+@seller_orders_bp.route('/seller/orders/status', methods=['PATCH'])
+def bulk_update_order_status():
+    """Move several of the seller's orders to the same status in one request"""
+    try:
+        is_auth, seller_id = require_seller_auth()
+        if not is_auth:
+            return jsonify({"error": "Unauthorized - Seller access required"}), 401
+        
+        data = request.get_json()
+        if not data or 'status' not in data or not data.get('order_ids'):
+            return jsonify({"error": "status and order_ids fields required"}), 400
+        
+        new_status = data['status']
+        if new_status not in VALID_STATUSES:
+            return jsonify({"error": f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}"}), 400
+        
+        order_ids = data['order_ids']
+        if not isinstance(order_ids, list) or not all(
+            isinstance(order_id, int) and not isinstance(order_id, bool) for order_id in order_ids
+        ):
+            return jsonify({"error": "order_ids must be a list of integers"}), 400
+        order_ids = list(dict.fromkeys(order_ids))
+        
+        if len(order_ids) > MAX_BULK_ORDERS:
+            return jsonify({"error": f"At most {MAX_BULK_ORDERS} orders can be updated at once"}), 400
+        
+        # Check ownership and current status of every order in one query
+        owned = dict(db.session.query(Order.id, Order.status).join(OrderItem).join(Product).filter(
+            Order.id.in_(order_ids), Product.seller_id == seller_id
+        ).distinct().all())
+        
+        results = []
+        to_update = []
+        for order_id in order_ids:
+            current_status = owned.get(order_id)
+            if current_status is None:
+                results.append({"order_id": order_id, "result": "not_found"})
+            elif current_status == new_status:
+                results.append({"order_id": order_id, "result": "unchanged", "status": current_status})
+            elif not can_transition(current_status, new_status):
+                results.append({
+                    "order_id": order_id,
+                    "result": "invalid_transition",
+                    "status": current_status,
+                    "error": f"Cannot change status from {current_status} to {new_status}"
+                })
+            else:
+                to_update.append(order_id)
+                results.append({"order_id": order_id, "result": "updated", "previous_status": current_status, "status": new_status})
+        
+        updated_count = 0
+        if to_update:
+            updated_ids, affected_sellers = transition_orders(
+                {order_id: owned[order_id] for order_id in to_update}, new_status, seller_id
+            )
+            updated_count = len(updated_ids)
+            
+            for result in results:
+                if result["result"] == "updated" and result["order_id"] not in updated_ids:
+                    result["result"] = "conflict"
+                    result["error"] = "Order status was changed by another request"
+            
+            db.session.commit()
+            invalidate_seller(affected_sellers, 'order_stats', 'dashboard')
+        
+        return jsonify({
+            "message": f"{updated_count} order(s) updated to {new_status}",
+            "new_status": new_status,
+            "updated_count": updated_count,
+            "results": results
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@seller_orders_bp.route('/seller/orders/export', methods=['GET'])
+def export_seller_orders():
+    """Stream every order line of the seller's products as CSV or NDJSON"""
     try:
         is_auth, seller_id = require_seller_auth()
         if not is_auth:
             return jsonify({"error": "Unauthorized - Seller access required"}), 401
         
-        # Get counts for different order statuses
-        stats = {}
-        statuses = ['pending', 'processing', 'shipped', 'delivered', 'cancelled']
+        fmt = request.args.get("format", "csv", type=str)
+        if fmt not in EXPORT_FORMATS:
+            return jsonify({"error": f"Invalid format. Must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
         
-        for status in statuses:
-            count = db.session.query(Order).join(OrderItem).join(Product).filter(
-                and_(Product.seller_id == seller_id, Order.status == status)
-            ).count()
-            stats[status] = count
+        try:
+            start, end = parse_date_range(request.args)
+        except ValueError:
+            return jsonify({"error": "Dates must use the YYYY-MM-DD format"}), 400
         
-        # Get total revenue (from delivered orders only)
-        revenue_result = db.session.query(
-            db.func.sum(OrderItem.price * OrderItem.quantity)
-        ).join(Order).join(Product).filter(
-            and_(Product.seller_id == seller_id, Order.status == 'delivered')
-        ).scalar()
+        status = request.args.get("status", "", type=str)
+        stmt = order_lines_query(seller_id=seller_id, start=start, end=end, status=status)
+        return stream_order_lines(stmt, fmt, f"seller-{seller_id}-orders")
+        
+    except Exception as e:
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+def compute_order_stats(seller_id):
+    """Per-status order counts and delivered revenue for a seller, read from the daily rollup"""
+    rows = db.session.query(
+        SellerDailyStat.status,
+        func.sum(SellerDailyStat.orders).label('orders'),
+        func.sum(SellerDailyStat.revenue).label('revenue')
+    ).filter(
+        SellerDailyStat.seller_id == seller_id
+    ).group_by(SellerDailyStat.status).all()
+    
+    stats = {status: 0 for status in VALID_STATUSES}
+    total_revenue = 0.0
+    for row in rows:
+        if row.status in stats:
+            stats[row.status] = row.orders
+        # Revenue counts delivered orders only
+        if row.status == 'delivered':
+            total_revenue = float(row.revenue or 0)
+    
+    stats['total_revenue'] = total_revenue
+    stats['total_orders'] = sum(stats[status] for status in VALID_STATUSES)
+    return stats
+
+@seller_orders_bp.route('/seller/orders/stats', methods=['GET'])
+def get_seller_order_stats():
+    """Get order statistics for the seller"""
+    try:
+        is_auth, seller_id = require_seller_auth()
+        if not is_auth:
+            return jsonify({"error": "Unauthorized - Seller access required"}), 401
         
-        stats['total_revenue'] = float(revenue_result) if revenue_result else 0.0
-        stats['total_orders'] = sum(stats[status] for status in statuses)
+        stats = get_or_compute(
+            seller_key(seller_id, 'order_stats'),
+            lambda: compute_order_stats(seller_id),
+            timeout=Config.SELLER_ORDER_STATS_TTL
+        )
         
         return jsonify({"stats": stats}), 200
         
@@ -247,423 +433,163 @@ def get_seller_dashboard_stats():
         if not is_auth:
             return jsonify({"error": "Unauthorized - Seller access required"}), 401
         
-        # Get product counts by category (using lowercase to match database)
-        clothes_count = Product.query.filter_by(seller_id=seller_id, category='clothes').count()
-        cosmetics_count = Product.query.filter_by(seller_id=seller_id, category='cosmetics').count()
-        electronics_count = Product.query.filter_by(seller_id=seller_id, category='electronics').count()
-        sports_count = Product.query.filter_by(seller_id=seller_id, category='sports').count()
+        return jsonify(build_dashboard(SellerAggregates(seller_id))), 200
         
-        # Get order statistics
-        total_orders = db.session.query(Order).join(OrderItem).join(Product).filter(
-            Product.seller_id == seller_id
-        ).distinct().count()
+    except Exception as e:
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@seller_orders_bp.route('/seller/analytics', methods=['GET'])
+def get_seller_analytics():
+    """Get comprehensive analytics data for the seller"""
+    try:
+        is_auth, seller_id = require_seller_auth()
+        if not is_auth:
+            return jsonify({"error": "Unauthorized - Seller access required"}), 401
         
-        # Get revenue (from delivered orders only)
-        revenue_result = db.session.query(
-            db.func.sum(OrderItem.price * OrderItem.quantity)
-        ).join(Order).join(Product).filter(
-            and_(Product.seller_id == seller_id, Order.status == 'delivered')
-        ).scalar()
+        time_range = request.args.get('time_range', 'monthly')  # daily, weekly, monthly, yearly
         
-        total_revenue = float(revenue_result) if revenue_result else 0.0
+        return jsonify(build_analytics(SellerAggregates(seller_id, time_range))), 200
         
-        # Get unique customers count (distinct users who have ordered from this seller)
-        customers_count = db.session.query(Order.user_id).join(OrderItem).join(Product).filter(
-            Product.seller_id == seller_id
-        ).distinct().count()
+    except Exception as e:
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@seller_orders_bp.route('/seller/earnings', methods=['GET'])
+def get_seller_earnings():
+    """Get comprehensive earnings data for the seller"""
+    try:
+        is_auth, seller_id = require_seller_auth()
+        if not is_auth:
+            return jsonify({"error": "Unauthorized - Seller access required"}), 401
         
-        # Get recent activities (last 10 notifications)
-        recent_notifications = Notification.query.filter_by(target_user=seller_id).order_by(
-            Notification.date.desc()
-        ).limit(10).all()
-        
-        # Format recent activities
-        recent_activities = []
-        for notif in recent_notifications:
-            # Calculate time ago
-            time_diff = datetime.utcnow() - notif.date
-            if time_diff.days > 0:
-                time_ago = f"{time_diff.days} day{'s' if time_diff.days > 1 else ''} ago"
-            elif time_diff.seconds > 3600:
-                hours = time_diff.seconds // 3600
-                time_ago = f"{hours} hour{'s' if hours > 1 else ''} ago"
-            elif time_diff.seconds > 60:
-                minutes = time_diff.seconds // 60
-                time_ago = f"{minutes} min ago"
-            else:
-                time_ago = "Just now"
-            
-            recent_activities.append({
-                "id": notif.id,
-                "type": notif.type,
-                "title": notif.title,
-                "message": notif.message,
-                "time_ago": time_ago,
-                "read": notif.read
-            })
+        time_range = request.args.get('time_range', 'monthly')  # daily, weekly, monthly, yearly
         
-        return jsonify({
-            "product_counts": {
-                "clothes": clothes_count,
-                "cosmetics": cosmetics_count,
-                "electronics": electronics_count,
-                "sports": sports_count,
-                "total": clothes_count + cosmetics_count + electronics_count + sports_count
-            },
-            "order_stats": {
-                "total_orders": total_orders,
-                "total_revenue": total_revenue,
-                "customers_count": customers_count
-            },
-            "recent_activities": recent_activities
-        }), 200
+        return jsonify(build_earnings(SellerAggregates(seller_id, time_range))), 200
         
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
-@seller_orders_bp.route('/seller/analytics', methods=['GET'])
-def get_seller_analytics():
-    """Get comprehensive analytics data for the seller"""
+@seller_orders_bp.route('/seller/overview', methods=['GET'])
+def get_seller_overview():
+    """Dashboard, analytics and earnings payloads in one response, sharing their aggregates"""
     try:
         is_auth, seller_id = require_seller_auth()
         if not is_auth:
             return jsonify({"error": "Unauthorized - Seller access required"}), 401
         
-        time_range = request.args.get('time_range', 'monthly')  # daily, weekly, monthly
+        # e.g. ?include=dashboard,earnings; everything by default
+        include = request.args.get('include')
+        reports = [name.strip() for name in include.split(',') if name.strip()] if include else SELLER_REPORTS
+        unknown = [name for name in reports if name not in REPORT_BUILDERS]
+        if unknown:
+            return jsonify({"error": f"Unknown report(s): {', '.join(unknown)}. Choose from {', '.join(SELLER_REPORTS)}"}), 400
         
-        # Get basic stats
-        total_orders = db.session.query(Order).join(OrderItem).join(Product).filter(
-            Product.seller_id == seller_id
-        ).distinct().count()
+        time_range = request.args.get('time_range', 'monthly')  # daily, weekly, monthly, yearly
+        aggregates = SellerAggregates(seller_id, time_range)
         
-        # Get revenue (from all orders, not just delivered)
-        revenue_result = db.session.query(
-            db.func.sum(OrderItem.price * OrderItem.quantity)
-        ).join(Order).join(Product).filter(
-            Product.seller_id == seller_id
-        ).scalar()
-        total_revenue = float(revenue_result) if revenue_result else 0.0
+        return jsonify({name: REPORT_BUILDERS[name](aggregates) for name in reports}), 200
         
-        # Calculate average order value
-        avg_order_value = total_revenue / total_orders if total_orders > 0 else 0.0
+    except Exception as e:
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@seller_orders_bp.route('/seller/products/performance', methods=['GET'])
+def get_seller_product_performance():
+    """Per-product sales over a date window (default: the last 30 days), sortable and paginated"""
+    try:
+        is_auth, seller_id = require_seller_auth()
+        if not is_auth:
+            return jsonify({"error": "Unauthorized - Seller access required"}), 401
         
-        # Get unique customers count
-        customers_count = db.session.query(Order.user_id).join(OrderItem).join(Product).filter(
-            Product.seller_id == seller_id
-        ).distinct().count()
+        try:
+            start, end = parse_date_range(request.args)
+        except ValueError:
+            return jsonify({"error": "Dates must use the YYYY-MM-DD format"}), 400
         
-        # Calculate conversion rate (simplified - orders vs unique customers)
-        conversion_rate = (customers_count / total_orders * 100) if total_orders > 0 else 0.0
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        end = end or today + timedelta(days=1)
+        start = start or end - timedelta(days=30)
+        if start >= end:
+            return jsonify({"error": "'from' must not be after 'to'"}), 400
         
-        # Get monthly revenue data (last 12 months)
-        from sqlalchemy import extract, func
-        monthly_revenue = db.session.query(
-            extract('month', Order.created_at).label('month'),
-            func.sum(OrderItem.price * OrderItem.quantity).label('revenue')
-        ).join(OrderItem).join(Product).filter(
-            Product.seller_id == seller_id,
-            extract('year', Order.created_at) == datetime.utcnow().year
-        ).group_by(extract('month', Order.created_at)).all()
-        
-        # Convert to list format for charts
-        revenue_data = [0] * 12
-        for month, revenue in monthly_revenue:
-            if month:
-                revenue_data[int(month) - 1] = float(revenue) if revenue else 0
-        
-        # Get monthly orders data
-        monthly_orders = db.session.query(
-            extract('month', Order.created_at).label('month'),
-            func.count(func.distinct(Order.id)).label('orders')
-        ).join(OrderItem).join(Product).filter(
-            Product.seller_id == seller_id,
-            extract('year', Order.created_at) == datetime.utcnow().year
-        ).group_by(extract('month', Order.created_at)).all()
-        
-        orders_data = [0] * 12
-        for month, orders in monthly_orders:
-            if month:
-                orders_data[int(month) - 1] = int(orders) if orders else 0
-        
-        # Get top buyers
-        top_buyers_query = db.session.query(
-            Order.user_id,
-            User.firstname,
-            User.secondname,
-            User.email,
-            func.count(func.distinct(Order.id)).label('order_count'),
-            func.sum(OrderItem.price * OrderItem.quantity).label('total_value')
-        ).join(OrderItem).join(Product).join(User, Order.user_id == User.id).filter(
-            Product.seller_id == seller_id
-        ).group_by(Order.user_id, User.firstname, User.secondname, User.email).order_by(
-            func.sum(OrderItem.price * OrderItem.quantity).desc()
-        ).limit(5).all()
-        
-        top_buyers = []
-        for buyer in top_buyers_query:
-            top_buyers.append({
-                "name": f"{buyer.firstname} {buyer.secondname}",
-                "email": buyer.email,
-                "purchases": buyer.order_count,
-                "value": float(buyer.total_value) if buyer.total_value else 0,
-                "location": "N/A"  # Add location field to user model if needed
-            })
-        
-        # Get sales by category
-        category_sales = db.session.query(
-            Product.category,
-            func.sum(OrderItem.price * OrderItem.quantity).label('total_sales'),
-            func.count(OrderItem.id).label('item_count')
-        ).join(OrderItem).join(Order).filter(
-            Product.seller_id == seller_id
-        ).group_by(Product.category).all()
-        
-        purchase_categories = []
-        total_category_sales = sum(float(sale.total_sales) for sale in category_sales if sale.total_sales)
-        
-        for category in category_sales:
-            if category.total_sales:
-                percentage = (float(category.total_sales) / total_category_sales * 100) if total_category_sales > 0 else 0
-                purchase_categories.append({
-                    "category": category.category.title(),
-                    "percentage": round(percentage, 1),
-                    "value": float(category.total_sales)
-                })
+        sort = request.args.get("sort", "revenue", type=str)
+        if sort not in PRODUCT_SORTS:
+            return jsonify({"error": f"Invalid sort. Must be one of: {', '.join(PRODUCT_SORTS)}"}), 400
+        direction = request.args.get("order", "desc", type=str)
+        if direction not in ('asc', 'desc'):
+            return jsonify({"error": "order must be 'asc' or 'desc'"}), 400
         
-        # Get new vs returning buyers (simplified)
-        new_buyers_monthly = [max(0, orders_data[i] - (orders_data[i-1] if i > 0 else 0)) for i in range(12)]
-        returning_buyers_monthly = [max(0, orders_data[i] - new_buyers_monthly[i]) for i in range(12)]
+        page = max(request.args.get("page", 1, type=int), 1)
+        per_page = min(max(request.args.get("per_page", 20, type=int), 1), 100)
         
-        # Mock buyer demographics (you can enhance this with real age data if available)
-        buyer_demographics = [
-            {"ageGroup": "18-24", "percentage": 20, "value": int(customers_count * 0.2)},
-            {"ageGroup": "25-34", "percentage": 35, "value": int(customers_count * 0.35)},
-            {"ageGroup": "35-44", "percentage": 25, "value": int(customers_count * 0.25)},
-            {"ageGroup": "45-54", "percentage": 15, "value": int(customers_count * 0.15)},
-            {"ageGroup": "55+", "percentage": 5, "value": int(customers_count * 0.05)}
-        ]
+        products, total = product_performance(seller_id, start, end, sort, direction, page, per_page)
         
         return jsonify({
-            "totalRevenue": {
-                "current": total_revenue,
-                "previous": total_revenue * 0.85,  # Mock previous period
-                "change": 18.4,  # Mock change percentage
-                "data": revenue_data
-            },
-            "totalOrders": {
-                "current": total_orders,
-                "previous": int(total_orders * 0.79),
-                "change": 26.4,
-                "data": orders_data
-            },
-            "averageOrderValue": {
-                "current": avg_order_value,
-                "previous": avg_order_value * 0.94,
-                "change": 5.96,
-                "data": [avg_order_value] * 12  # Mock monthly AOV data
-            },
-            "conversionRate": {
-                "current": conversion_rate,
-                "previous": conversion_rate * 0.77,
-                "change": 23.1,
-                "data": [conversion_rate] * 12  # Mock monthly conversion data
-            },
-            "buyerDemographics": buyer_demographics,
-            "topBuyers": top_buyers,
-            "purchaseCategories": purchase_categories,
-            "buyerActivity": {
-                "labels": ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'],
-                "newBuyers": new_buyers_monthly,
-                "returningBuyers": returning_buyers_monthly
-            }
+            "products": products,
+            "from": start.strftime('%Y-%m-%d'),
+            "to": (end - timedelta(days=1)).strftime('%Y-%m-%d'),
+            "total": total,
+            "pages": (total + per_page - 1) // per_page,
+            "current_page": page
         }), 200
         
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
-@seller_orders_bp.route('/seller/earnings', methods=['GET'])
-def get_seller_earnings():
-    """Get comprehensive earnings data for the seller"""
+@seller_orders_bp.route('/seller/low-stock', methods=['GET'])
+def get_seller_low_stock():
+    """Get the seller's low-stock threshold and the products currently below it"""
     try:
         is_auth, seller_id = require_seller_auth()
         if not is_auth:
             return jsonify({"error": "Unauthorized - Seller access required"}), 401
         
-        time_range = request.args.get('time_range', 'monthly')  # daily, weekly, monthly, yearly
+        seller = User.query.get(seller_id)
+        threshold = seller.low_stock_threshold if seller.low_stock_threshold is not None else Config.LOW_STOCK_THRESHOLD
         
-        # Get total earnings from all orders (delivered and processing)
-        total_earnings_result = db.session.query(
-            db.func.sum(OrderItem.price * OrderItem.quantity)
-        ).join(Order).join(Product).filter(
-            Product.seller_id == seller_id,
-            Order.status.in_(['delivered', 'processing', 'shipped'])
-        ).scalar()
-        total_earnings = float(total_earnings_result) if total_earnings_result else 0.0
-        
-        # Get this month's earnings
-        from sqlalchemy import extract, func
-        current_month = datetime.utcnow().month
-        current_year = datetime.utcnow().year
-        
-        this_month_earnings = db.session.query(
-            func.sum(OrderItem.price * OrderItem.quantity)
-        ).join(Order).join(Product).filter(
-            Product.seller_id == seller_id,
-            Order.status.in_(['delivered', 'processing', 'shipped']),
-            extract('month', Order.created_at) == current_month,
-            extract('year', Order.created_at) == current_year
-        ).scalar()
-        this_month_earnings = float(this_month_earnings) if this_month_earnings else 0.0
-        
-        # Get pending earnings (orders not yet delivered)
-        pending_earnings = db.session.query(
-            func.sum(OrderItem.price * OrderItem.quantity)
-        ).join(Order).join(Product).filter(
+        products = Product.query.filter(
             Product.seller_id == seller_id,
-            Order.status.in_(['pending', 'processing', 'shipped'])
-        ).scalar()
-        pending_earnings = float(pending_earnings) if pending_earnings else 0.0
-        
-        # Get completed earnings (delivered orders only)
-        completed_earnings = db.session.query(
-            func.sum(OrderItem.price * OrderItem.quantity)
-        ).join(Order).join(Product).filter(
-            Product.seller_id == seller_id,
-            Order.status == 'delivered'
-        ).scalar()
-        completed_earnings = float(completed_earnings) if completed_earnings else 0.0
-        
-        # Get monthly earnings for the past 12 months
-        monthly_earnings = []
-        monthly_orders = []
-        
-        for i in range(12):
-            target_month = (current_month - i - 1) % 12 + 1
-            target_year = current_year if (current_month - i - 1) >= 0 else current_year - 1
-            
-            month_earnings = db.session.query(
-                func.sum(OrderItem.price * OrderItem.quantity)
-            ).join(Order).join(Product).filter(
-                Product.seller_id == seller_id,
-                Order.status.in_(['delivered', 'processing', 'shipped']),
-                extract('month', Order.created_at) == target_month,
-                extract('year', Order.created_at) == target_year
-            ).scalar()
-            
-            month_orders = db.session.query(
-                func.count(func.distinct(Order.id))
-            ).join(OrderItem).join(Product).filter(
-                Product.seller_id == seller_id,
-                extract('month', Order.created_at) == target_month,
-                extract('year', Order.created_at) == target_year
-            ).scalar()
-            
-            monthly_earnings.insert(0, float(month_earnings) if month_earnings else 0.0)
-            monthly_orders.insert(0, int(month_orders) if month_orders else 0)
-        
-        # Get recent transactions (last 10)
-        recent_transactions = db.session.query(
-            Order.id,
-            Order.order_number,
-            Order.created_at,
-            Order.status,
-            User.firstname,
-            User.secondname,
-            func.sum(OrderItem.price * OrderItem.quantity).label('order_total')
-        ).join(OrderItem).join(Product).join(User, Order.user_id == User.id).filter(
-            Product.seller_id == seller_id
-        ).group_by(
-            Order.id, Order.order_number, Order.created_at, Order.status, 
-            User.firstname, User.secondname
-        ).order_by(Order.created_at.desc()).limit(10).all()
-        
-        transactions = []
-        for transaction in recent_transactions:
-            transactions.append({
-                "id": f"#ORD-{transaction.id}",
-                "customer": f"{transaction.firstname} {transaction.secondname}",
-                "date": transaction.created_at.strftime('%Y-%m-%d') if transaction.created_at else "N/A",
-                "amount": float(transaction.order_total) if transaction.order_total else 0.0,
-                "status": "completed" if transaction.status == "delivered" else 
-                         "pending" if transaction.status in ["pending", "processing", "shipped"] else "failed"
-            })
-        
-        # Calculate average order value
-        total_orders = db.session.query(Order).join(OrderItem).join(Product).filter(
-            Product.seller_id == seller_id
-        ).distinct().count()
-        
-        avg_order_value = total_earnings / total_orders if total_orders > 0 else 0.0
+            Product.stock < threshold
+        ).order_by(Product.stock, Product.id).all()
         
-        # Calculate conversion rate (orders vs unique customers)
-        unique_customers = db.session.query(Order.user_id).join(OrderItem).join(Product).filter(
-            Product.seller_id == seller_id
-        ).distinct().count()
-        
-        conversion_rate = (unique_customers / total_orders * 100) if total_orders > 0 else 0.0
-        
-        # Calculate refund rate (cancelled orders)
-        cancelled_orders = db.session.query(Order).join(OrderItem).join(Product).filter(
-            Product.seller_id == seller_id,
-            Order.status == 'cancelled'
-        ).distinct().count()
+        return jsonify({
+            "threshold": threshold,
+            "is_default": seller.low_stock_threshold is None,
+            "products": [product.to_dict() for product in products]
+        }), 200
         
-        refund_rate = (cancelled_orders / total_orders * 100) if total_orders > 0 else 0.0
+    except Exception as e:
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@seller_orders_bp.route('/seller/low-stock', methods=['PATCH'])
+def update_seller_low_stock_threshold():
+    """Set the seller's low-stock threshold; null restores the default"""
+    try:
+        is_auth, seller_id = require_seller_auth()
+        if not is_auth:
+            return jsonify({"error": "Unauthorized - Seller access required"}), 401
         
-        # Calculate growth percentages (mock for previous periods)
-        total_earnings_growth = 12.5 if total_earnings > 0 else 0.0
-        this_month_growth = 8.3 if this_month_earnings > 0 else 0.0
-        pending_change = -3.2 if pending_earnings > 0 else 0.0
-        completed_growth = 10.7 if completed_earnings > 0 else 0.0
+        data = request.get_json() or {}
+        if 'threshold' not in data:
+            return jsonify({"error": "threshold is required"}), 400
+        threshold = data['threshold']
+        if threshold is not None and (not isinstance(threshold, int) or isinstance(threshold, bool) or threshold < 0):
+            return jsonify({"error": "threshold must be a non-negative integer or null"}), 400
+        
+        seller = User.query.get(seller_id)
+        seller.low_stock_threshold = threshold
+        # Every product is measured against the new threshold on the next scan
+        db.session.execute(
+            update(Product).where(Product.seller_id == seller_id)
+            .values(stock_changed_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
         
         return jsonify({
-            "totalEarnings": {
-                "current": total_earnings,
-                "growth": total_earnings_growth,
-                "data": monthly_earnings
-            },
-            "thisMonth": {
-                "current": this_month_earnings,
-                "growth": this_month_growth
-            },
-            "pending": {
-                "current": pending_earnings,
-                "change": pending_change
-            },
-            "completed": {
-                "current": completed_earnings,
-                "growth": completed_growth
-            },
-            "earningsData": [
-                {"month": "Jan", "earnings": monthly_earnings[0], "orders": monthly_orders[0]},
-                {"month": "Feb", "earnings": monthly_earnings[1], "orders": monthly_orders[1]},
-                {"month": "Mar", "earnings": monthly_earnings[2], "orders": monthly_orders[2]},
-                {"month": "Apr", "earnings": monthly_earnings[3], "orders": monthly_orders[3]},
-                {"month": "May", "earnings": monthly_earnings[4], "orders": monthly_orders[4]},
-                {"month": "Jun", "earnings": monthly_earnings[5], "orders": monthly_orders[5]},
-                {"month": "Jul", "earnings": monthly_earnings[6], "orders": monthly_orders[6]},
-                {"month": "Aug", "earnings": monthly_earnings[7], "orders": monthly_orders[7]},
-                {"month": "Sep", "earnings": monthly_earnings[8], "orders": monthly_orders[8]},
-                {"month": "Oct", "earnings": monthly_earnings[9], "orders": monthly_orders[9]},
-                {"month": "Nov", "earnings": monthly_earnings[10], "orders": monthly_orders[10]},
-                {"month": "Dec", "earnings": monthly_earnings[11], "orders": monthly_orders[11]}
-            ],
-            "recentTransactions": transactions,
-            "performanceMetrics": {
-                "averageOrderValue": {
-                    "current": avg_order_value,
-                    "change": 5.2 if avg_order_value > 0 else 0.0
-                },
-                "conversionRate": {
-                    "current": conversion_rate,
-                    "change": 1.7 if conversion_rate > 0 else 0.0
-                },
-                "refundRate": {
-                    "current": refund_rate,
-                    "change": -0.8  # Negative is good for refunds
-                }
-            }
+            "message": "Low-stock threshold updated",
+            "threshold": threshold if threshold is not None else Config.LOW_STOCK_THRESHOLD,
+            "is_default": threshold is None
         }), 200
         
     except Exception as e:
-        return jsonify({"error": f"Server error: {str(e)}"}), 500
\ No newline at end of file
+        db.session.rollback()
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
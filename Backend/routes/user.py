@@ -2,6 +2,9 @@ from flask import Blueprint, request, jsonify, session
 from app import db
 from app.models import User,Product
 from utils.email_utils import send_welcome_email
+from utils.cart import get_cart, merge_cart_lines
+from utils.rollups import rollup_new_users
+from datetime import datetime
 import bcrypt
 import re
 
@@ -70,6 +73,7 @@ def register_user():
         )
 
         db.session.add(new_user)
+        rollup_new_users(datetime.utcnow().date())
         db.session.commit()
 
         # =========================
@@ -115,6 +119,15 @@ def login_buyer():
         session['is_admin'] = user.is_admin
         session['logged_in'] = True
 
+        # Merge the guest cart kept by the frontend into the server cart
+        if data.get('cart'):
+            try:
+                merge_cart_lines(get_cart(user.id, create=True), data['cart'])
+                db.session.commit()
+            except Exception as cart_error:
+                db.session.rollback()
+                print(f"❌ Failed to merge cart on login: {cart_error}")
+
         return jsonify({
             "message": "Buyer login successful",
             "user": user.to_dict(),
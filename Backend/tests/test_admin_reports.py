@@ -0,0 +1,30 @@
+import pytest
+
+
+@pytest.fixture
+def admin(make_user, client_as):
+    return client_as(make_user("admin", is_admin=True))
+
+
+def test_seller_order_stats_ranks_sellers_by_revenue(admin, make_user, make_product, make_order):
+    sellers = [make_user("seller"), make_user("seller"), make_user("seller")]
+    buyer = make_user()
+    make_order(buyer, [(make_product(sellers[1], price=30.0), 2)], status="delivered")
+    make_order(buyer, [(make_product(sellers[2], price=5.0), 1)], status="delivered")
+    make_order(buyer, [(make_product(sellers[2], price=99.0), 1)], status="pending")
+
+    body = admin.get("/admin/sellers/orders-stats", query_string={"per_page": 2}).get_json()
+    assert (body["total_sellers"], body["pages"]) == (3, 2)
+    assert [(s["id"], s["total_revenue"], s["total_orders"]) for s in body["sellers"]] == [
+        (sellers[1].id, 60.0, 1), (sellers[2].id, 5.0, 2)
+    ]
+
+
+def test_seller_order_stats_reports_the_total_past_the_last_page(admin, make_user):
+    for _ in range(3):
+        make_user("seller")
+    response = admin.get("/admin/sellers/orders-stats", query_string={"page": 5, "per_page": 2})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["sellers"] == []
+    assert (body["total_sellers"], body["pages"], body["current_page"]) == (3, 2, 5)
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+
+
+def test_history_pages_follow_next_cursor(client_as, make_user, make_order):
+    buyer = make_user()
+    start = datetime(2026, 1, 1)
+    orders = [make_order(buyer, [], created_at=start + timedelta(hours=i)) for i in range(5)]
+    make_order(make_user(), [])
+    client = client_as(buyer)
+
+    seen, cursor = [], None
+    while True:
+        query = {"limit": 2, "summary": "true", **({"cursor": cursor} if cursor else {})}
+        body = client.get(f"/orders/{buyer.id}", query_string=query).get_json()
+        seen.extend(order["id"] for order in body["orders"])
+        cursor = body["next_cursor"]
+        assert body["has_more"] == (cursor is not None)
+        if not cursor:
+            break
+    assert seen == [order.id for order in reversed(orders)]
+
+
+def test_totals_cover_the_whole_history(client_as, make_user, make_product, make_order):
+    buyer = make_user()
+    product = make_product(make_user("seller"), price=12.5)
+    for _ in range(25):
+        make_order(buyer, [(product, 2)])
+    make_order(make_user(), [(product, 1)])
+
+    response = client_as(buyer).get(f"/orders/{buyer.id}/totals")
+    assert response.status_code == 200
+    assert response.get_json() == {"total_orders": 25, "total_spent": 625.0}
+
+
+def test_totals_are_private_to_the_buyer(client_as, make_user):
+    buyer = make_user()
+    assert client_as(make_user()).get(f"/orders/{buyer.id}/totals").status_code == 401
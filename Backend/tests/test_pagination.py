@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models import Order
+from utils.pagination import (
+    after_cursor, after_rank_cursor, decode_cursor, encode_cursor, encode_rank_cursor
+)
+
+
+def _pages(query_page, limit):
+    """Follow cursors until the last page; returns every id seen, in order"""
+    seen, cursor = [], None
+    while True:
+        rows = query_page(cursor, limit + 1)
+        seen.extend(row.id for row in rows[:limit])
+        if len(rows) <= limit:
+            return seen
+        cursor = rows[limit - 1]
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 3, 1, 12, 30, 5, 123456)
+    cursor = encode_cursor(created_at, 42)
+    assert decode_cursor(cursor) == (created_at, 42)
+    assert all(c.isalnum() or c in "-_=" for c in cursor)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", encode_rank_cursor(1.0, 3), "MjAyNi0wMS0wMQ=="])
+def test_decode_cursor_rejects_malformed(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7])
+def test_after_cursor_pages_newest_first_without_gaps(make_user, make_order, limit):
+    buyer = make_user()
+    start = datetime(2026, 1, 1)
+    # Several orders share a timestamp, so the id has to break ties
+    orders = [make_order(buyer, [], created_at=start + timedelta(minutes=i // 3)) for i in range(10)]
+
+    def page(last, size):
+        query = Order.query
+        if last is not None:
+            query = query.filter(after_cursor(Order.created_at, Order.id, encode_cursor(last.created_at, last.id)))
+        return query.order_by(Order.created_at.desc(), Order.id.desc()).limit(size).all()
+
+    expected = [o.id for o in sorted(orders, key=lambda o: (o.created_at, o.id), reverse=True)]
+    assert _pages(page, limit) == expected
+
+
+def test_rank_cursor_round_trips_float_scores():
+    for score in [0.0, -0.123456789012345, 1e-300, -3.0000000000000004]:
+        predicate = after_rank_cursor(db.literal(score), db.literal(1), encode_rank_cursor(score, 1))
+        # Exactly at the cursor position: not after it
+        assert db.session.execute(db.select(predicate)).scalar() in (False, 0)
+
+
+@pytest.mark.parametrize("cursor", ["", "@@", encode_cursor(datetime(2026, 1, 1), 1)])
+def test_after_rank_cursor_rejects_malformed(cursor):
+    with pytest.raises(ValueError):
+        after_rank_cursor(db.literal(0.0), db.literal(0), cursor)
+
+
+@pytest.mark.parametrize("limit", [1, 2, 4])
+def test_after_rank_cursor_pages_by_score_then_id(make_user, make_order, limit):
+    buyer = make_user()
+    orders = [make_order(buyer, []) for _ in range(9)]
+    # A score with ties and values that are not exact in binary
+    scores = {order.id: -(order.id % 3) / 3 for order in orders}
+    score = db.case(scores, value=Order.id)
+
+    def page(last, size):
+        stmt = db.select(Order.id, score.label("score"))
+        if last is not None:
+            stmt = stmt.where(after_rank_cursor(score, Order.id, encode_rank_cursor(last.score, last.id)))
+        return db.session.execute(stmt.order_by(score, Order.id).limit(size)).all()
+
+    expected = [order_id for order_id, _ in sorted(scores.items(), key=lambda item: (item[1], item[0]))]
+    assert _pages(page, limit) == expected
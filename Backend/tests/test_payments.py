@@ -0,0 +1,176 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.config import Config
+from app.models import Order, OrderEvent, Payment
+import utils.payments as payments
+from utils.payments import GatewayError, SimulatedGateway
+
+SECRET = "test-webhook-secret"
+
+
+class RecordingGateway(SimulatedGateway):
+    """Gateway double: records charges instead of scheduling a confirmation"""
+    name = "recording"
+    failures = []
+    charges = []
+
+    def charge(self, payment, timeout):
+        type(self).charges.append(payment.transaction_id)
+        if type(self).failures:
+            raise type(self).failures.pop(0)
+
+
+@pytest.fixture(autouse=True)
+def gateway(monkeypatch):
+    RecordingGateway.failures, RecordingGateway.charges = [], []
+    monkeypatch.setitem(payments.GATEWAYS, RecordingGateway.name, RecordingGateway)
+    monkeypatch.setitem(Config.PAYMENT_GATEWAYS, "card", RecordingGateway.name)
+    monkeypatch.setattr(Config, "PAYMENT_WEBHOOK_SECRET", SECRET)
+    monkeypatch.setattr(Config, "PAYMENT_RETRY_BACKOFF_SECONDS", 0)
+    return RecordingGateway
+
+
+@pytest.fixture
+def payment(make_user, make_product, make_order):
+    seller, buyer = make_user("seller"), make_user()
+    order = make_order(buyer, [(make_product(seller, price=20.0), 1)])
+    payment = Payment(order_id=order.id, user_id=buyer.id, payment_method="card", amount=20.0, status="pending")
+    db.session.add(payment)
+    db.session.commit()
+    return payment
+
+
+def _callback(app, payload, signature=None, sign=True):
+    body = json.dumps(payload).encode("utf-8")
+    headers = {}
+    if sign:
+        headers["X-Signature"] = signature or SimulatedGateway().sign(body)
+    return app.test_client().post(
+        f"/payments/callback/{RecordingGateway.name}", data=body, content_type="application/json", headers=headers
+    )
+
+
+def _submitted(payment):
+    payments.process_payment(payment.id)
+    db.session.expire_all()
+    return db.session.get(Payment, payment.id)
+
+
+def test_reference_is_committed_before_the_gateway_is_called(payment, gateway, monkeypatch):
+    seen = []
+
+    def charge(self, submitted, timeout):
+        # A callback is handled on another connection; it must already find the payment
+        with db.engine.connect() as other:
+            seen.append(other.execute(
+                db.select(Payment.transaction_id).where(Payment.id == submitted.id)
+            ).scalar())
+
+    monkeypatch.setattr(gateway, "charge", charge)
+    result = _submitted(payment)
+    assert result.status == "submitted"
+    assert seen == [result.transaction_id] and result.transaction_id.startswith("SIM-")
+
+
+def test_a_payment_is_claimed_only_once(payment, gateway):
+    assert payments.claim_payment(payment.id)
+    assert not payments.claim_payment(payment.id)
+    payments.process_payment(payment.id)
+    assert gateway.charges == []
+
+
+def test_transient_errors_are_retried_with_the_same_reference(payment, gateway):
+    gateway.failures = [GatewayError("timeout")]
+    result = _submitted(payment)
+    assert result.status == "submitted"
+    assert result.attempts == 2
+    assert gateway.charges == [result.transaction_id] * 2
+
+
+def test_permanent_error_fails_the_payment_and_cancels_the_order(payment, gateway):
+    gateway.failures = [GatewayError("card declined", retryable=False)]
+    result = _submitted(payment)
+    assert result.status == "failed"
+    assert result.last_error == "card declined"
+    assert db.session.get(Order, payment.order_id).status == "cancelled"
+
+
+def test_sweeper_resubmits_payments_left_in_processing(payment, gateway):
+    stale = datetime.utcnow() - timedelta(seconds=Config.PAYMENT_RESUBMIT_AFTER_SECONDS + 60)
+    db.session.execute(db.update(Payment).where(Payment.id == payment.id).values(status="processing", updated_at=stale))
+    db.session.commit()
+    assert payments.sweep_payments() == (1, 0)
+    db.session.expire_all()
+    assert db.session.get(Payment, payment.id).status == "submitted"
+
+
+def test_callbacks_are_rejected_without_a_webhook_secret(app, payment, monkeypatch):
+    reference = _submitted(payment).transaction_id
+    monkeypatch.setattr(Config, "PAYMENT_WEBHOOK_SECRET", None)
+    response = _callback(app, {"reference": reference, "status": "success"}, signature="anything")
+    assert response.status_code == 503
+    assert not SimulatedGateway().verify_signature(b"{}", "anything")
+
+
+@pytest.mark.parametrize("signature, sign", [("0" * 64, True), (None, False)])
+def test_callbacks_with_a_bad_signature_are_rejected(app, payment, signature, sign):
+    reference = _submitted(payment).transaction_id
+    response = _callback(app, {"reference": reference, "status": "success"}, signature=signature, sign=sign)
+    assert response.status_code == 401
+    db.session.expire_all()
+    assert db.session.get(Payment, payment.id).status == "submitted"
+
+
+def test_successful_callback_completes_the_payment_once(app, payment):
+    reference = _submitted(payment).transaction_id
+    for _ in range(2):
+        response = _callback(app, {"reference": reference, "status": "success"})
+        assert response.status_code == 200
+
+    db.session.expire_all()
+    assert db.session.get(Payment, payment.id).status == "completed"
+    assert db.session.get(Order, payment.order_id).status == "processing"
+    events = OrderEvent.query.filter_by(order_id=payment.order_id).all()
+    assert [(event.from_status, event.to_status) for event in events] == [("pending", "processing")]
+
+
+def test_failed_callback_cancels_the_order(app, payment):
+    reference = _submitted(payment).transaction_id
+    response = _callback(app, {"reference": reference, "status": "failed", "message": "insufficient funds"})
+    assert response.status_code == 200
+    db.session.expire_all()
+    result = db.session.get(Payment, payment.id)
+    assert (result.status, result.last_error) == ("failed", "insufficient funds")
+    assert db.session.get(Order, payment.order_id).status == "cancelled"
+
+
+def test_late_callback_does_not_undo_a_seller_cancellation(app, payment):
+    reference = _submitted(payment).transaction_id
+    db.session.execute(db.update(Order).where(Order.id == payment.order_id).values(status="cancelled"))
+    db.session.commit()
+    assert _callback(app, {"reference": reference, "status": "success"}).status_code == 200
+    db.session.expire_all()
+    assert db.session.get(Order, payment.order_id).status == "cancelled"
+
+
+def test_callback_for_an_unknown_reference_is_not_found(app, payment):
+    assert _callback(app, {"reference": "SIM-UNKNOWN", "status": "success"}).status_code == 404
+
+
+def test_sellers_cannot_move_an_unpaid_order_to_processing(app, payment, client_as):
+    reference = _submitted(payment).transaction_id
+    seller = client_as(db.session.get(Order, payment.order_id).items[0].product.seller)
+
+    response = seller.patch(f"/seller/orders/{payment.order_id}/status", json={"status": "processing"})
+    assert response.status_code == 409
+    response = seller.patch("/seller/orders/status", json={"order_ids": [payment.order_id], "status": "processing"})
+    assert response.get_json()["results"][0]["result"] == "invalid_transition"
+
+    # The failed payment still cancels the order it belongs to
+    assert _callback(app, {"reference": reference, "status": "failed"}).status_code == 200
+    db.session.expire_all()
+    assert db.session.get(Order, payment.order_id).status == "cancelled"
@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models import Order, Payment, PlatformDailyStat, SellerDailyStat
+import routes.checkout
+from utils.payments import apply_payment_result
+from utils.rollups import (
+    backfill_platform_stats, backfill_seller_stats, rollup_new_orders, rollup_new_users, rollup_status_changes
+)
+
+
+@pytest.fixture(autouse=True)
+def no_payment_jobs(monkeypatch):
+    monkeypatch.setattr(routes.checkout, "submit_payment", lambda payment_id: None)
+
+
+def _snapshot(model, key_columns):
+    """Rollup rows as {key: values}, leaving out rows whose values all went back to zero"""
+    rows = {}
+    for row in model.query.all():
+        values = {column.name: getattr(row, column.name) for column in model.__table__.columns}
+        key = tuple(values.pop(column) for column in key_columns)
+        values = {name: round(value, 6) for name, value in values.items()}
+        if any(values.values()):
+            rows[key] = values
+    return rows
+
+
+def rebuild_rollups():
+    """Start from exact rollups; fixture users and orders bypass the write path"""
+    backfill_seller_stats()
+    backfill_platform_stats()
+
+
+def assert_rollups_match_backfill():
+    """The incrementally maintained rollups equal a full rebuild from the order tables"""
+    db.session.expire_all()
+    seller_rows = _snapshot(SellerDailyStat, ["seller_id", "day", "status"])
+    platform_rows = _snapshot(PlatformDailyStat, ["day"])
+    rebuild_rollups()
+    db.session.expire_all()
+    assert seller_rows == _snapshot(SellerDailyStat, ["seller_id", "day", "status"])
+    assert platform_rows == _snapshot(PlatformDailyStat, ["day"])
+
+
+def _checkout(client, *lines):
+    response = client.post("/checkout", json={
+        "items": [{"id": product.id, "price": product.price, "quantity": quantity} for product, quantity in lines],
+        "shipping_info": {
+            "firstName": "A", "lastName": "B", "email": "a@b.co", "phone": "0700000000",
+            "address": "Street 1", "city": "Garissa", "state": "Garissa", "zip": "70100"
+        },
+        "payment_method": "card"
+    })
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()["order"]["id"]
+
+
+def _move(client, order_ids, status):
+    response = client.patch("/seller/orders/status", json={"order_ids": order_ids, "status": status})
+    assert response.status_code == 200, response.get_json()
+
+
+def test_checkout_and_status_changes_keep_rollups_exact(make_user, make_product, client_as):
+    sellers = [make_user("seller"), make_user("seller")]
+    products = [make_product(sellers[0], price=12.5), make_product(sellers[1], price=7.0), make_product(sellers[0], price=3.2)]
+    buyers = [make_user(), make_user()]
+    rebuild_rollups()
+
+    orders = [
+        _checkout(client_as(buyers[0]), (products[0], 2), (products[1], 1)),
+        _checkout(client_as(buyers[0]), (products[2], 1)),
+        _checkout(client_as(buyers[1]), (products[0], 1), (products[2], 3)),
+    ]
+    assert_rollups_match_backfill()
+
+    # Confirmed payments move the orders to processing
+    for payment in Payment.query.filter(Payment.order_id.in_(orders)):
+        apply_payment_result(payment, True)
+    db.session.commit()
+    assert_rollups_match_backfill()
+
+    seller = client_as(sellers[0])
+    _move(seller, orders[:1], "cancelled")
+    _move(seller, orders[1:], "shipped")
+    assert client_as(sellers[0]).patch(f"/seller/orders/{orders[2]}/status", json={"status": "delivered"}).status_code == 200
+    assert_rollups_match_backfill()
+
+
+def test_month_buyers_count_the_first_order_of_the_month(make_user, make_product, make_order):
+    seller = make_user("seller")
+    product = make_product(seller)
+    buyer = make_user()
+    rebuild_rollups()
+    now = datetime.utcnow()
+    month_start = datetime(now.year, now.month, 1, 6)
+
+    later = make_order(buyer, [(product, 1)], created_at=month_start + timedelta(days=1))
+    rollup_new_orders([later.id])
+    db.session.commit()
+    # An order placed earlier in the month moves the buyer's count to that day
+    earlier = make_order(buyer, [(product, 1)], created_at=month_start)
+    rollup_new_orders([earlier.id])
+    db.session.commit()
+
+    db.session.expire_all()
+    assert db.session.get(PlatformDailyStat, month_start.date()).month_buyers == 1
+    assert db.session.get(PlatformDailyStat, (month_start + timedelta(days=1)).date()).month_buyers == 0
+    assert_rollups_match_backfill()
+
+
+def test_registration_counts_new_users(app):
+    client = app.test_client()
+    response = client.post("/register", json={
+        "firstname": "Amina", "secondname": "Abdi", "email": "amina.abdi@gmail.com", "phone": "0712345678",
+        "password": "Passw0rd!x", "confirmPassword": "Passw0rd!x", "account_type": "buyer"
+    })
+    assert response.status_code == 201, response.get_json()
+    today = datetime.utcnow().date()
+    rollup_new_users(today, 2)
+    db.session.commit()
+    db.session.expire_all()
+    assert db.session.get(PlatformDailyStat, today).new_users == 3
@@ -0,0 +1,35 @@
+import pytest
+
+from app import db
+from app.models import Order
+
+
+@pytest.fixture
+def seller_order(make_user, make_product, make_order):
+    seller = make_user("seller")
+    order = make_order(make_user(), [(make_product(seller), 1)], status="processing")
+    return seller, order
+
+
+def test_bulk_update_moves_owned_orders_and_reports_the_rest(client_as, seller_order, make_user, make_product, make_order):
+    seller, order = seller_order
+    other = make_order(make_user(), [(make_product(make_user("seller")), 1)], status="processing")
+
+    response = client_as(seller).patch(
+        "/seller/orders/status", json={"order_ids": [order.id, other.id, order.id], "status": "shipped"}
+    )
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["updated_count"] == 1
+    assert [(r["order_id"], r["result"]) for r in body["results"]] == [(order.id, "updated"), (other.id, "not_found")]
+    db.session.expire_all()
+    assert (db.session.get(Order, order.id).status, db.session.get(Order, other.id).status) == ("shipped", "processing")
+
+
+@pytest.mark.parametrize("order_ids", ["10", [True], [1.9], ["1"], {"1": 1}, [[1]]])
+def test_bulk_update_rejects_order_ids_that_are_not_a_list_of_integers(client_as, seller_order, order_ids):
+    seller, order = seller_order
+    response = client_as(seller).patch("/seller/orders/status", json={"order_ids": order_ids, "status": "shipped"})
+    assert response.status_code == 400
+    db.session.expire_all()
+    assert db.session.get(Order, order.id).status == "processing"
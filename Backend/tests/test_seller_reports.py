@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta
+
+from utils.rollups import backfill_seller_buyers
+from utils.seller_reports import SellerAggregates
+
+
+def test_buyers_counts_everyone_and_each_comparison_window(make_user, make_product, make_order):
+    seller = make_user("seller")
+    product = make_product(seller)
+    other_seller_product = make_product(make_user("seller"))
+    regular, returning, former = make_user(), make_user(), make_user()
+    now = datetime.utcnow()
+
+    make_order(regular, [(product, 1)], created_at=now - timedelta(days=1))
+    make_order(regular, [(product, 1)], created_at=now - timedelta(days=2))
+    make_order(regular, [(product, 1)], created_at=now - timedelta(days=40))
+    make_order(returning, [(product, 1)], created_at=now - timedelta(days=45))
+    make_order(former, [(product, 1)], created_at=now - timedelta(days=400))
+    make_order(make_user(), [(other_seller_product, 1)], created_at=now - timedelta(days=1))
+    backfill_seller_buyers()
+
+    # Monthly: the current window is the last 30 days, the previous one the 30 days before
+    assert SellerAggregates(seller.id, "monthly", now).buyers == {"all": 3, "current": 1, "previous": 2}
+
+
+def test_overview_reports_customers_from_seller_buyers(client_as, make_user, make_product, make_order):
+    seller = make_user("seller")
+    product = make_product(seller)
+    for buyer in (make_user(), make_user()):
+        make_order(buyer, [(product, 1)], status="delivered")
+    backfill_seller_buyers()
+
+    response = client_as(seller).get("/seller/overview", query_string={"include": "dashboard,analytics,earnings"})
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()["dashboard"]["order_stats"]["customers_count"] == 2
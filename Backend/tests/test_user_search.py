@@ -0,0 +1,46 @@
+import pytest
+from flask_migrate import downgrade, upgrade
+
+from app import db
+from conftest import MIGRATIONS
+
+# The revision before the FTS index was added
+BEFORE_FTS_INDEX = "d2f6b8a4c913"
+
+
+@pytest.fixture
+def users(make_user):
+    make_user(firstname="Amina", secondname="Abdi")
+    make_user(firstname="Hamid", secondname="Noor", email="hamid.noor@gmail.com")
+    make_user(firstname="Fatuma", secondname="Ali")
+    make_user("seller", firstname="Samira", secondname="Aden")
+
+
+@pytest.fixture
+def without_fts_index(app):
+    """A schema without users_fts, as built by db.create_all() in the setup scripts"""
+    db.session.commit()
+    downgrade(directory=MIGRATIONS, revision=BEFORE_FTS_INDEX)
+    yield
+    db.session.rollback()
+    upgrade(directory=MIGRATIONS)
+
+
+def _search(client, path, term):
+    response = client.get(path, query_string={"search": term})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_search_matches_with_and_without_the_fts_index(request, users, make_user, client_as, indexed):
+    if not indexed:
+        request.getfixturevalue("without_fts_index")
+    client = client_as(make_user("admin", is_admin=True))
+
+    buyers = _search(client, "/admin/buyers", "ami")
+    assert sorted(buyer["firstname"] for buyer in buyers["buyers"]) == ["Amina", "Hamid"]
+    assert buyers["total"] == 2
+
+    sellers = _search(client, "/admin_sellers/sellers", "ami")
+    assert [seller["firstname"] for seller in sellers["sellers"]] == ["Samira"]
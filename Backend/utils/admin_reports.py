@@ -0,0 +1,379 @@
+# app/utils/admin_reports.py
+from datetime import date, datetime, timedelta
+from sqlalchemy import and_, case, func
+from app import db
+from app.config import Config
+from app.models import Order, OrderItem, Product, User, SellerDailyStat, PlatformDailyStat
+from utils.analytics import month_bucket, last_n_months, month_key, percent_change
+from utils.cache import admin_key, get_or_compute
+from utils.rollups import COMPLETED_ORDER_STATUSES, PLATFORM_STATUS_COLUMNS
+
+# Months charted on the platform analytics and earnings dashboards
+ANALYTICS_MONTHS = 12
+
+# Order statuses counted as open in the seller order statistics
+OPEN_ORDER_STATUSES = ['pending', 'processing', 'confirmed']
+
+
+def _conversion(orders, users):
+    return round(orders / users * 100, 1) if users > 0 else 0
+
+
+def _platform_months(months, *columns):
+    """
+    Sums of the given platform_daily_stats columns for each (year, month), read
+    from the rollup in one grouped query; months without activity are zero.
+    """
+    bucket = month_bucket(PlatformDailyStat.day)
+    rows = db.session.query(
+        bucket.label('month'),
+        *[func.sum(getattr(PlatformDailyStat, column)).label(column) for column in columns]
+    ).filter(
+        PlatformDailyStat.day >= date(*months[0], 1)
+    ).group_by(bucket).all()
+    by_month = {row.month: row for row in rows}
+
+    totals = []
+    for year, month in months:
+        row = by_month.get(month_key(year, month))
+        totals.append({column: (getattr(row, column) or 0) if row else 0 for column in columns})
+    return totals
+
+
+def platform_user_counts():
+    """Seller and buyer counts, all and active, from one conditional-aggregation query over users"""
+    def count_where(*conditions):
+        return func.count(case((and_(*conditions), User.id)))
+
+    is_seller = User.account_type == 'seller'
+    is_buyer = User.account_type == 'buyer'
+    is_active = User.status == 'active'
+    row = db.session.query(
+        count_where(is_seller).label('sellers'),
+        count_where(is_buyer).label('buyers'),
+        count_where(is_seller, is_active).label('active_sellers'),
+        count_where(is_buyer, is_active).label('active_buyers')
+    ).filter(User.account_type.in_(['seller', 'buyer'])).one()
+    return row._asdict()
+
+
+def platform_order_totals():
+    """All-time order count, revenue and status counts, summed from platform_daily_stats"""
+    row = db.session.query(
+        func.coalesce(func.sum(PlatformDailyStat.orders), 0).label('orders'),
+        func.coalesce(func.sum(PlatformDailyStat.revenue), 0).label('revenue'),
+        *[
+            func.coalesce(func.sum(getattr(PlatformDailyStat, column)), 0).label(column)
+            for column in PLATFORM_STATUS_COLUMNS.values()
+        ]
+    ).one()
+    return row._asdict()
+
+
+def build_platform_analytics(now=None):
+    """
+    Platform-wide analytics for the admin dashboard.
+    The 12-month series, the current and previous month figures and the current
+    month's status distribution are summed from platform_daily_stats in one
+    grouped query; top products for the current month are one more query.
+    """
+    now = now or datetime.utcnow()
+    months = last_n_months(ANALYTICS_MONTHS, now)
+    current_month_start = date(*months[-1], 1)
+
+    status_columns = list(PLATFORM_STATUS_COLUMNS.values())
+    totals = _platform_months(months, 'orders', 'revenue', 'month_buyers', *status_columns)
+
+    monthly_data = [
+        {
+            "month": date(year, month, 1).strftime("%b"),
+            "orders": int(month_totals['orders']),
+            "revenue": float(month_totals['revenue']),
+            "users": int(month_totals['month_buyers'])
+        }
+        for (year, month), month_totals in zip(months, totals)
+    ]
+    current, previous = monthly_data[-1], monthly_data[-2]
+
+    top_products = db.session.query(
+        Product.name,
+        func.sum(OrderItem.quantity).label('total_sold'),
+        func.sum(OrderItem.price * OrderItem.quantity).label('total_revenue')
+    ).join(OrderItem).join(Order).filter(
+        Order.created_at >= current_month_start
+    ).group_by(Product.id, Product.name).order_by(
+        func.sum(OrderItem.quantity).desc()
+    ).limit(5).all()
+
+    order_statuses = [
+        (status, int(totals[-1][column]))
+        for status, column in PLATFORM_STATUS_COLUMNS.items() if totals[-1][column]
+    ]
+
+    current_conversion = _conversion(current["orders"], current["users"])
+    previous_conversion = _conversion(previous["orders"], previous["users"])
+
+    return {
+        "metrics": {
+            "total_sales": {
+                "current": current["orders"],
+                "previous": previous["orders"],
+                "change": percent_change(current["orders"], previous["orders"]),
+                "data": [month["orders"] for month in monthly_data]
+            },
+            "active_users": {
+                "current": current["users"],
+                "previous": previous["users"],
+                "change": percent_change(current["users"], previous["users"]),
+                "data": [month["users"] for month in monthly_data]
+            },
+            "revenue": {
+                "current": current["revenue"],
+                "previous": previous["revenue"],
+                "change": percent_change(current["revenue"], previous["revenue"]),
+                "data": [month["revenue"] for month in monthly_data]
+            },
+            "conversion_rate": {
+                "current": current_conversion,
+                "previous": previous_conversion,
+                "change": percent_change(current_conversion, previous_conversion),
+                "data": [_conversion(month["orders"], month["users"]) for month in monthly_data]
+            }
+        },
+        "monthly_data": monthly_data,
+        "top_products": [
+            {
+                "name": product.name,
+                "sales": int(product.total_sold),
+                "revenue": float(product.total_revenue)
+            }
+            for product in top_products
+        ],
+        "order_statuses": [
+            {
+                "status": status,
+                "count": count,
+                "percentage": round(count / current["orders"] * 100, 1) if current["orders"] > 0 else 0
+            }
+            for status, count in order_statuses
+        ]
+    }
+
+
+# ===== Earnings =====
+
+def build_platform_earnings(now=None):
+    """
+    Platform earnings, fees and payouts for the admin dashboard, cached for
+    ADMIN_EARNINGS_TTL seconds.
+
+    Every monthly, current-month and payout figure is summed from
+    platform_daily_stats in one grouped query, and top sellers from
+    seller_daily_stats; recent payouts are one query over the last 30 days.
+    """
+    return get_or_compute(
+        admin_key('earnings'),
+        lambda: _compute_platform_earnings(now or datetime.utcnow()),
+        timeout=Config.ADMIN_EARNINGS_TTL
+    )
+
+
+def _compute_platform_earnings(now):
+    fee_rate = Config.PLATFORM_FEE_RATE
+    months = last_n_months(ANALYTICS_MONTHS, now)
+    current_month_start = date(*months[-1], 1)
+
+    totals = _platform_months(
+        months, 'revenue', 'fees', 'orders', 'delivered_orders', 'completed_revenue', 'pending_revenue'
+    )
+    current, previous = totals[-1], totals[-2]
+
+    current_month_revenue = float(current['revenue'])
+    last_month_revenue = float(previous['revenue'])
+    current_month_platform_fees = float(current['fees'])
+    last_month_platform_fees = float(previous['fees'])
+    current_month_transactions = int(current['orders'])
+
+    monthly_data = [
+        {
+            "month": date(year, month, 1).strftime("%b"),
+            "earnings": float(month_totals['revenue']),
+            "fees": float(month_totals['fees']),
+            "payouts": float(month_totals['revenue'] - month_totals['fees'])
+        }
+        for (year, month), month_totals in zip(months, totals)
+    ]
+
+    completed_payouts = float(current['completed_revenue']) * (1 - fee_rate)
+    pending_payouts = float(current['pending_revenue']) * (1 - fee_rate)
+
+    avg_transaction = current_month_revenue / current_month_transactions if current_month_transactions > 0 else 0
+    payout_completion_rate = (current['delivered_orders'] / current_month_transactions * 100) if current_month_transactions > 0 else 0
+
+    # Top earning sellers this month; an order is in one day/status row per seller, so orders add up
+    top_sellers = db.session.query(
+        User.firstname,
+        User.secondname,
+        func.sum(SellerDailyStat.revenue).label('total_earnings'),
+        func.sum(SellerDailyStat.orders).label('total_orders')
+    ).join(User, SellerDailyStat.seller_id == User.id).filter(
+        SellerDailyStat.day >= current_month_start
+    ).group_by(User.id, User.firstname, User.secondname).order_by(
+        func.sum(SellerDailyStat.revenue).desc()
+    ).limit(5).all()
+
+    # Recent payouts (simulated from each seller's share of recent orders)
+    recent_orders = db.session.query(
+        Order.id,
+        User.firstname,
+        User.secondname,
+        Order.created_at,
+        func.sum(OrderItem.price * OrderItem.quantity).label('order_total'),
+        Order.status
+    ).join(OrderItem).join(Product).join(User, Product.seller_id == User.id).filter(
+        Order.created_at >= (now - timedelta(days=30))
+    ).group_by(Order.id, User.firstname, User.secondname, Order.created_at, Order.status).order_by(
+        Order.created_at.desc()
+    ).limit(5).all()
+
+    growth = percent_change(current_month_revenue, last_month_revenue)
+    return {
+        "metrics": {
+            "total_earnings": {
+                "current": current_month_revenue,
+                "previous": last_month_revenue,
+                "change": growth,
+                "growth_rate": growth
+            },
+            "platform_fees": {
+                "current": current_month_platform_fees,
+                "previous": last_month_platform_fees,
+                "percentage": fee_rate * 100
+            },
+            "seller_payouts": {
+                "current": current_month_revenue - current_month_platform_fees,
+                "previous": last_month_revenue - last_month_platform_fees,
+                "transactions": current_month_transactions
+            },
+            "average_transaction": {
+                "current": float(avg_transaction),
+                "transactions": current_month_transactions
+            },
+            "payout_distribution": {
+                "completed": completed_payouts,
+                "pending": pending_payouts,
+                "completion_rate": round(payout_completion_rate, 1)
+            }
+        },
+        "chart_data": monthly_data,
+        "top_sellers": [
+            {
+                "name": f"{seller.firstname} {seller.secondname}",
+                "earnings": float(seller.total_earnings * (1 - fee_rate)),
+                "sales": int(seller.total_orders),
+                "revenue": float(seller.total_earnings)
+            }
+            for seller in top_sellers
+        ],
+        "recent_payouts": [
+            {
+                "id": f"PAY-{order.id:04d}",
+                "seller": f"{order.firstname} {order.secondname}",
+                "date": order.created_at.strftime("%Y-%m-%d"),
+                "amount": float(order.order_total * (1 - fee_rate)),
+                "status": 'completed' if order.status in COMPLETED_ORDER_STATUSES else 'pending'
+            }
+            for order in recent_orders
+        ],
+        "platform_stats": {
+            "fee_rate": fee_rate * 100,
+            "payout_completion": round(payout_completion_rate, 1),
+            "dispute_rate": 2.1  # Placeholder - would come from dispute tracking system
+        }
+    }
+
+
+# ===== Seller order statistics =====
+
+SELLER_ORDER_SORTS = ['total_revenue', 'total_orders', 'pending_orders', 'completed_orders', 'total_products', 'name']
+
+
+def seller_order_stats(sort='total_revenue', direction='desc', page=1, per_page=50):
+    """
+    Open and completed order counts, completed revenue and product count for one
+    page of sellers.
+
+    One statement: order lines are grouped by products.seller_id and products
+    by seller in two derived tables, both left-joined to the sellers so those
+    without products or orders are listed too. The number of sellers is counted
+    separately, so pages past the last one still report it. Returns (rows, total).
+    """
+    is_open = Order.status.in_(OPEN_ORDER_STATUSES)
+    is_completed = Order.status.in_(COMPLETED_ORDER_STATUSES)
+    orders = db.session.query(
+        Product.seller_id.label('seller_id'),
+        func.count(func.distinct(case((is_open, Order.id)))).label('pending_orders'),
+        func.count(func.distinct(case((is_completed, Order.id)))).label('completed_orders'),
+        func.sum(case((is_completed, OrderItem.price * OrderItem.quantity), else_=0)).label('total_revenue')
+    ).select_from(OrderItem).join(
+        Order, OrderItem.order_id == Order.id
+    ).join(
+        Product, OrderItem.product_id == Product.id
+    ).group_by(Product.seller_id).subquery()
+
+    products = db.session.query(
+        Product.seller_id.label('seller_id'),
+        func.count(Product.id).label('total_products')
+    ).group_by(Product.seller_id).subquery()
+
+    pending_orders = func.coalesce(orders.c.pending_orders, 0)
+    completed_orders = func.coalesce(orders.c.completed_orders, 0)
+    columns = {
+        'total_revenue': func.coalesce(orders.c.total_revenue, 0),
+        'total_orders': pending_orders + completed_orders,
+        'pending_orders': pending_orders,
+        'completed_orders': completed_orders,
+        'total_products': func.coalesce(products.c.total_products, 0),
+        'name': User.firstname + ' ' + User.secondname
+    }
+
+    sort_column = columns[sort]
+    sort_column = sort_column.asc() if direction == 'asc' else sort_column.desc()
+
+    rows = db.session.query(
+        User.id,
+        User.firstname,
+        User.secondname,
+        User.email,
+        User.phone,
+        User.status,
+        columns['total_products'].label('total_products'),
+        pending_orders.label('pending_orders'),
+        completed_orders.label('completed_orders'),
+        columns['total_revenue'].label('total_revenue')
+    ).outerjoin(
+        orders, orders.c.seller_id == User.id
+    ).outerjoin(
+        products, products.c.seller_id == User.id
+    ).filter(
+        User.account_type == 'seller'
+    ).order_by(
+        sort_column, User.id
+    ).offset((page - 1) * per_page).limit(per_page).all()
+
+    total = db.session.query(func.count(User.id)).filter(User.account_type == 'seller').scalar()
+    return [
+        {
+            "id": row.id,
+            "name": f"{row.firstname} {row.secondname}",
+            "email": row.email,
+            "phone": row.phone,
+            "status": row.status,
+            "total_products": int(row.total_products),
+            "pending_orders": int(row.pending_orders),
+            "completed_orders": int(row.completed_orders),
+            "total_orders": int(row.pending_orders) + int(row.completed_orders),
+            "total_revenue": float(row.total_revenue)
+        }
+        for row in rows
+    ], total
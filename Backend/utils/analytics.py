@@ -0,0 +1,118 @@
+# app/utils/analytics.py
+from datetime import date, datetime, timedelta
+from sqlalchemy import case, func
+from app import db
+
+
+def dialect_name():
+    return db.session.get_bind().dialect.name
+
+
+def time_bucket(column, unit):
+    """
+    Text bucket key for a date/timestamp column, on both SQLite and PostgreSQL:
+    'YYYY-MM-DD' for day, the Monday 'YYYY-MM-DD' for week, 'YYYY-MM' for month, 'YYYY' for year.
+    """
+    if dialect_name() == 'postgresql':
+        if unit == 'week':
+            return func.to_char(func.date_trunc('week', column), 'YYYY-MM-DD')
+        return func.to_char(column, {'day': 'YYYY-MM-DD', 'month': 'YYYY-MM', 'year': 'YYYY'}[unit])
+    if unit == 'week':
+        # 'weekday 0' moves forward to Sunday (or stays there); six days back is that week's Monday
+        return func.date(column, 'weekday 0', '-6 days')
+    return func.strftime({'day': '%Y-%m-%d', 'month': '%Y-%m', 'year': '%Y'}[unit], column)
+
+
+def month_bucket(column):
+    """'YYYY-MM' label for a timestamp column, on both SQLite and PostgreSQL"""
+    return time_bucket(column, 'month')
+
+
+def day_bucket(column):
+    """Calendar day of a timestamp column (date() exists on both SQLite and PostgreSQL)"""
+    return func.date(column)
+
+
+def last_n_months(n, now=None):
+    """The last n months as (year, month) tuples, oldest first, ending with the current month"""
+    now = now or datetime.utcnow()
+    months = []
+    year, month = now.year, now.month
+    for _ in range(n):
+        months.append((year, month))
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+    return list(reversed(months))
+
+
+def month_key(year, month):
+    return f"{year:04d}-{month:02d}"
+
+
+# Bucket unit and number of buckets charted for each time_range
+SERIES_RANGES = {
+    'daily': ('day', 30),
+    'weekly': ('week', 12),
+    'monthly': ('month', 12),
+    'yearly': ('year', 5)
+}
+
+
+def series_buckets(time_range, now=None):
+    """
+    Dense bucket layout for a chart over time_range, oldest first.
+    Returns (unit, start_date, keys, labels); keys match time_bucket() output and
+    start_date is the first day of the oldest bucket, for a range predicate.
+    """
+    unit, count = SERIES_RANGES.get(time_range, SERIES_RANGES['monthly'])
+    today = (now or datetime.utcnow()).date()
+
+    if unit == 'day':
+        starts = [today - timedelta(days=i) for i in reversed(range(count))]
+        return unit, starts[0], [d.isoformat() for d in starts], [d.strftime('%b %d') for d in starts]
+    if unit == 'week':
+        monday = today - timedelta(days=today.weekday())
+        starts = [monday - timedelta(weeks=i) for i in reversed(range(count))]
+        return unit, starts[0], [d.isoformat() for d in starts], [d.strftime('%b %d') for d in starts]
+    if unit == 'month':
+        months = last_n_months(count, now)
+        keys = [month_key(y, m) for y, m in months]
+        labels = [date(y, m, 1).strftime('%b') for y, m in months]
+        return unit, date(*months[0], 1), keys, labels
+
+    years = [today.year - i for i in reversed(range(count))]
+    return unit, date(years[0], 1, 1), [f"{y:04d}" for y in years], [str(y) for y in years]
+
+
+# Length in days of the rolling window compared against the window before it
+PERIOD_DAYS = {'daily': 1, 'weekly': 7, 'monthly': 30, 'yearly': 365}
+
+
+def comparison_windows(time_range, now=None):
+    """
+    (previous_start, current_start, end) dates for period-over-period figures:
+    the current window is the last N days including today, the previous window
+    the N days before it. `end` is exclusive.
+    """
+    days = PERIOD_DAYS.get(time_range, PERIOD_DAYS['monthly'])
+    today = (now or datetime.utcnow()).date()
+    end = today + timedelta(days=1)
+    current_start = end - timedelta(days=days)
+    return current_start - timedelta(days=days), current_start, end
+
+
+def window_case(column, current_start, previous_start):
+    """'current' / 'previous' / 'earlier' label of a date column relative to comparison_windows()"""
+    return case(
+        (column >= current_start, 'current'),
+        (column >= previous_start, 'previous'),
+        else_='earlier'
+    )
+
+
+def percent_change(current, previous):
+    """Growth from previous to current in percent, rounded to one decimal"""
+    if not previous:
+        return 100.0 if current else 0.0
+    return round((current - previous) / previous * 100, 1)
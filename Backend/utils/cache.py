@@ -0,0 +1,31 @@
+# app/utils/cache.py
+from cachelib import SimpleCache
+from app.config import Config
+
+# In-process cache for expensive dashboard aggregates. Entries are short-lived,
+# so each worker process may briefly serve slightly different values.
+cache = SimpleCache(threshold=Config.CACHE_THRESHOLD, default_timeout=Config.CACHE_DEFAULT_TIMEOUT)
+
+
+def seller_key(seller_id, name):
+    return f"seller:{seller_id}:{name}"
+
+
+def admin_key(name):
+    return f"admin:{name}"
+
+
+def get_or_compute(key, compute, timeout=None):
+    """Return the cached value for key, computing and storing it on a miss"""
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout=timeout)
+    return value
+
+
+def invalidate_seller(seller_ids, *names):
+    """Drop the named cache entries of each given seller, e.g. after their orders changed"""
+    keys = [seller_key(seller_id, name) for seller_id in seller_ids for name in names]
+    if keys:
+        cache.delete_many(*keys)
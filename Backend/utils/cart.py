@@ -0,0 +1,111 @@
+# app/utils/cart.py
+from app import db
+from app.models import Cart, CartItem, Product
+
+
+def get_cart(user_id, create=False):
+    """Return the user's cart, optionally creating an empty one"""
+    cart = Cart.query.filter_by(user_id=user_id).first()
+    if not cart and create:
+        cart = Cart(user_id=user_id)
+        db.session.add(cart)
+        db.session.flush()
+    return cart
+
+
+def find_line(cart, product_id, color=None, size=None):
+    """Find an existing line for the same product variant"""
+    for item in cart.items:
+        if item.product_id == product_id and item.color == color and item.size == size:
+            return item
+    return None
+
+
+def merge_cart_lines(cart, lines):
+    """
+    Merge client-side cart lines into the server cart.
+    Quantities of matching variants are added up; prices always come from Product.
+    Returns the number of lines that referenced unknown products.
+    """
+    product_ids = {int(line.get('product_id', line.get('id'))) for line in lines}
+    products = {
+        p.id: p for p in Product.query.filter(Product.id.in_(product_ids)).all()
+    } if product_ids else {}
+
+    skipped = 0
+    for line in lines:
+        product = products.get(int(line.get('product_id', line.get('id'))))
+        quantity = int(line.get('quantity', 1))
+        if not product or quantity < 1:
+            skipped += 1
+            continue
+
+        existing = find_line(cart, product.id, line.get('color'), line.get('size'))
+        if existing:
+            existing.quantity += quantity
+        else:
+            cart.items.append(CartItem(
+                product_id=product.id,
+                quantity=quantity,
+                unit_price=product.price,
+                color=line.get('color'),
+                size=line.get('size')
+            ))
+    return skipped
+
+
+def revalidate_cart(cart, refresh_snapshots=True):
+    """
+    Check every cart line against the current Product rows using one query.
+
+    Each line gets a status: 'ok', 'price_changed', 'insufficient_stock',
+    'out_of_stock' or 'unavailable' (product deleted). When refresh_snapshots is
+    True the stored price snapshots are moved to the current price, so a change
+    is reported to the buyer once.
+
+    Returns the JSON-ready summary and the loaded products keyed by id.
+    """
+    items = list(cart.items) if cart else []
+    product_ids = {item.product_id for item in items}
+    products = {
+        p.id: p for p in Product.query.filter(Product.id.in_(product_ids)).all()
+    } if product_ids else {}
+
+    lines = []
+    subtotal = 0.0
+    valid = bool(items)
+    for item in items:
+        product = products.get(item.product_id)
+        line = item.to_dict()
+        line["product"] = product.to_dict() if product else None
+
+        if not product:
+            line["status"] = "unavailable"
+        elif (product.stock or 0) <= 0:
+            line["status"] = "out_of_stock"
+        elif item.quantity > product.stock:
+            line["status"] = "insufficient_stock"
+            line["available"] = product.stock
+        elif product.price != item.unit_price:
+            line["status"] = "price_changed"
+            line["previous_price"] = item.unit_price
+            line["unit_price"] = product.price
+            line["subtotal"] = product.price * item.quantity
+        else:
+            line["status"] = "ok"
+
+        if line["status"] != "ok":
+            valid = False
+        if product:
+            subtotal += product.price * item.quantity
+            if refresh_snapshots and item.unit_price != product.price:
+                item.unit_price = product.price
+
+        lines.append(line)
+
+    return {
+        "items": lines,
+        "subtotal": subtotal,
+        "item_count": sum(item.quantity for item in items),
+        "valid": valid
+    }, products
@@ -0,0 +1,109 @@
+# app/utils/exports.py
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from flask import Response, stream_with_context
+from sqlalchemy import select
+from app import db
+from app.models import Order, OrderItem, Product, User
+
+EXPORT_FORMATS = ['csv', 'ndjson']
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = [
+    'order_id', 'order_number', 'order_date', 'status', 'buyer_name', 'buyer_email',
+    'seller_id', 'product_id', 'product_name', 'quantity', 'unit_price', 'line_total'
+]
+
+
+def parse_date_range(args):
+    """
+    Read optional `from` and `to` dates (YYYY-MM-DD, both inclusive).
+    Returns (start, end) datetimes with `end` exclusive. Raises ValueError.
+    """
+    start = end = None
+    if args.get('from'):
+        start = datetime.strptime(args['from'], '%Y-%m-%d')
+    if args.get('to'):
+        end = datetime.strptime(args['to'], '%Y-%m-%d') + timedelta(days=1)
+    return start, end
+
+
+def order_lines_query(seller_id=None, start=None, end=None, status=None):
+    """One row per order line, joined to its order, product and buyer (if still present)"""
+    stmt = select(
+        Order.id, Order.order_number, Order.created_at, Order.status,
+        User.firstname, User.secondname, User.email,
+        Product.seller_id, Product.id, Product.name,
+        OrderItem.quantity, OrderItem.price
+    ).select_from(OrderItem).join(
+        Order, OrderItem.order_id == Order.id
+    ).join(
+        Product, OrderItem.product_id == Product.id
+    ).outerjoin(
+        User, Order.user_id == User.id
+    )
+
+    if seller_id is not None:
+        stmt = stmt.where(Product.seller_id == seller_id)
+    if start:
+        stmt = stmt.where(Order.created_at >= start)
+    if end:
+        stmt = stmt.where(Order.created_at < end)
+    if status:
+        stmt = stmt.where(Order.status == status)
+
+    return stmt.order_by(Order.id, OrderItem.id)
+
+
+def _row_to_record(row):
+    (order_id, order_number, created_at, status, firstname, secondname, email,
+     seller_id, product_id, product_name, quantity, price) = row
+    return {
+        'order_id': order_id,
+        'order_number': order_number,
+        'order_date': created_at.isoformat() if created_at else None,
+        'status': status,
+        'buyer_name': f"{firstname} {secondname}" if firstname else None,
+        'buyer_email': email,
+        'seller_id': seller_id,
+        'product_id': product_id,
+        'product_name': product_name,
+        'quantity': quantity,
+        'unit_price': price,
+        'line_total': price * quantity
+    }
+
+
+def stream_order_lines(stmt, fmt, filename):
+    """
+    Stream the query result as CSV or NDJSON.
+    Rows are fetched in batches (server-side cursor where the driver supports it)
+    and written out one line at a time, so memory use does not grow with the export.
+    """
+    def generate():
+        result = db.session.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        try:
+            if fmt == 'csv':
+                buffer = io.StringIO()
+                writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+                writer.writeheader()
+                for row in result:
+                    writer.writerow(_row_to_record(row))
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate(0)
+                yield buffer.getvalue()
+            else:
+                for row in result:
+                    yield json.dumps(_row_to_record(row)) + '\n'
+        finally:
+            result.close()
+
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}.{fmt}"}
+    )
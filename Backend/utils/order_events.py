@@ -0,0 +1,72 @@
+# app/utils/order_events.py
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from app import db
+from app.config import Config
+from app.models import OrderEvent
+
+ORDER_CREATED = 'created'
+ORDER_STATUS_CHANGED = 'status_changed'
+ORDER_CANCELLED = 'cancelled'
+
+EVENT_TYPES = [ORDER_CREATED, ORDER_STATUS_CHANGED, ORDER_CANCELLED]
+
+
+def _status_event_type(to_status):
+    return ORDER_CANCELLED if to_status == 'cancelled' else ORDER_STATUS_CHANGED
+
+
+def record_order_created(order, actor_id=None):
+    """Add a 'created' event for a new (flushed) order to the current session"""
+    db.session.add(OrderEvent(
+        order_id=order.id,
+        event_type=ORDER_CREATED,
+        to_status=order.status,
+        actor_id=actor_id,
+        created_at=datetime.utcnow()
+    ))
+
+
+def record_status_changes(changes, to_status, actor_id=None):
+    """
+    Add one status event per (order_id, from_status) pair to the current session.
+    The caller commits, so events are written in the same transaction as the change.
+    """
+    now = datetime.utcnow()
+    db.session.add_all([
+        OrderEvent(
+            order_id=order_id,
+            event_type=_status_event_type(to_status),
+            from_status=from_status,
+            to_status=to_status,
+            actor_id=actor_id,
+            created_at=now
+        )
+        for order_id, from_status in changes
+    ])
+
+
+def read_order_events(after=0, limit=100, event_types=None):
+    """
+    Return up to `limit` events with an id greater than `after`, oldest first.
+    Consumers store the id of the last event they processed and pass it back
+    as `after` to receive only new events.
+
+    Ids are assigned at insert time, so a transaction can commit an event with a
+    lower id after a higher one is already visible. Reads stop before the oldest
+    event younger than Config.ORDER_EVENT_COMMIT_LAG_SECONDS: everything below
+    that high-water mark was written long enough ago to have committed, so an
+    offset never moves past an event that is still in flight.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=Config.ORDER_EVENT_COMMIT_LAG_SECONDS)
+    high_water = db.session.query(func.min(OrderEvent.id)).filter(
+        OrderEvent.id > after,
+        OrderEvent.created_at > cutoff
+    ).scalar()
+
+    query = OrderEvent.query.filter(OrderEvent.id > after)
+    if high_water is not None:
+        query = query.filter(OrderEvent.id < high_water)
+    if event_types:
+        query = query.filter(OrderEvent.event_type.in_(event_types))
+    return query.order_by(OrderEvent.id.asc()).limit(limit).all()
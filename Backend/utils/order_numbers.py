@@ -0,0 +1,142 @@
+# app/utils/order_numbers.py
+import fcntl
+import os
+import threading
+import time
+from app.config import Config
+
+# Snowflake layout: 41 bits of milliseconds | 10 bits worker id | 12 bits sequence
+# The worker id is split into 5 bits of host id and 5 bits of per-process slot
+EPOCH_MS = 1735689600000  # 2025-01-01T00:00:00Z
+HOST_ID_BITS = 5
+SLOT_BITS = 5
+WORKER_ID_BITS = HOST_ID_BITS + SLOT_BITS
+SEQUENCE_BITS = 12
+MAX_HOST_ID = (1 << HOST_ID_BITS) - 1
+MAX_SLOTS = 1 << SLOT_BITS
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+ID_WIDTH = 13  # a 63-bit id never needs more than 13 base36 digits
+
+
+class ClockMovedBackwards(RuntimeError):
+    """The system clock stayed behind the last issued id for longer than ORDER_CLOCK_WAIT_MS"""
+
+
+def to_base36(value):
+    """Fixed-width base36 so that string order matches numeric order"""
+    digits = []
+    while value:
+        value, rem = divmod(value, 36)
+        digits.append(ALPHABET[rem])
+    return ''.join(reversed(digits)).rjust(ID_WIDTH, '0')
+
+
+def claim_worker_slot(lock_dir):
+    """
+    Claim the lowest free slot on this host by taking an exclusive lock on its
+    lock file. The lock lives as long as the returned descriptor, so the slot is
+    released when the process exits, even if it crashes. Returns (slot, fd).
+    """
+    os.makedirs(lock_dir, exist_ok=True)
+    for slot in range(MAX_SLOTS):
+        fd = os.open(os.path.join(lock_dir, f"slot-{slot}.lock"), os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            continue
+        return slot, fd
+    raise RuntimeError(f"All {MAX_SLOTS} order worker slots in {lock_dir} are taken")
+
+
+class SnowflakeGenerator:
+    """
+    Time-ordered unique id generator.
+
+    Ids are unique across processes without a database round-trip: each host
+    has its own host id and each process on it holds its own worker slot, which
+    is claimed again after a fork so forked workers never share one.
+    """
+
+    def __init__(self, host_id=0, lock_dir=None, clock_wait_ms=2000):
+        if not 0 <= host_id <= MAX_HOST_ID:
+            raise ValueError(f"Host id must be between 0 and {MAX_HOST_ID}")
+        self._host_id = host_id
+        self._lock_dir = lock_dir
+        self._clock_wait_ms = clock_wait_ms
+        self._lock = threading.Lock()
+        self._slot_fd = None
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        if self._slot_fd is not None:
+            # Inherited from the parent process: the parent keeps its own lock
+            os.close(self._slot_fd)
+        slot, self._slot_fd = claim_worker_slot(self._lock_dir)
+        self.worker_id = (self._host_id << SLOT_BITS) | slot
+        self._last_ms = -1
+        self._sequence = 0
+
+    def _wait_past(self, last_ms):
+        """Wait until the clock is past last_ms, but no longer than clock_wait_ms"""
+        deadline = time.monotonic() + self._clock_wait_ms / 1000
+        now = self._now_ms()
+        while now <= last_ms:
+            if time.monotonic() > deadline:
+                raise ClockMovedBackwards(f"Clock is {last_ms - now} ms behind the last issued order number")
+            time.sleep(min((last_ms - now + 1) / 1000, 0.01))
+            now = self._now_ms()
+        return now
+
+    def next_id(self):
+        with self._lock:
+            if os.getpid() != self._pid:
+                self._reset()
+
+            now = self._now_ms()
+            if now < self._last_ms:
+                # The system clock was set back - never reuse a past timestamp
+                now = self._wait_past(self._last_ms - 1)
+
+            if now == self._last_ms:
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    # Sequence exhausted for this millisecond - wait for the next one
+                    now = self._wait_past(self._last_ms)
+            else:
+                self._sequence = 0
+
+            self._last_ms = now
+            return (
+                ((now - EPOCH_MS) << (WORKER_ID_BITS + SEQUENCE_BITS))
+                | (self.worker_id << SEQUENCE_BITS)
+                | self._sequence
+            )
+
+    @staticmethod
+    def _now_ms():
+        return time.time_ns() // 1_000_000
+
+
+_generator = None
+_generator_lock = threading.Lock()
+
+
+def get_generator():
+    """Process-wide generator, configured from ORDER_HOST_ID and ORDER_WORKER_LOCK_DIR"""
+    global _generator
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                _generator = SnowflakeGenerator(
+                    Config.ORDER_HOST_ID, Config.ORDER_WORKER_LOCK_DIR, Config.ORDER_CLOCK_WAIT_MS
+                )
+    return _generator
+
+
+def generate_order_number():
+    """Generate a unique, k-sortable order number, e.g. ORD-0A1B2C3D4E5F6"""
+    return f"ORD-{to_base36(get_generator().next_id())}"
@@ -0,0 +1,62 @@
+# app/utils/pagination.py
+import base64
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(created_at, row_id):
+    """
+    Encode the (created_at, id) position of the last row on a page
+    into an opaque, URL-safe cursor string.
+    """
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor().
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        created_at, row_id = raw.split('|', 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def after_cursor(created_at_column, id_column, cursor):
+    """
+    Keyset predicate for rows that come after the cursor position
+    when ordering by (created_at DESC, id DESC).
+    """
+    created_at, row_id = decode_cursor(cursor)
+    return or_(
+        created_at_column < created_at,
+        and_(created_at_column == created_at, id_column < row_id)
+    )
+
+
+def encode_rank_cursor(score, row_id):
+    """Encode the (score, id) position of the last row on a ranked page into a cursor"""
+    raw = f"{score!r}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def after_rank_cursor(score_column, id_column, cursor):
+    """
+    Keyset predicate for rows that come after the cursor position
+    when ordering by (score ASC, id ASC), lower scores ranking first.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        score, row_id = raw.split('|', 1)
+        score, row_id = float(score), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    return or_(
+        score_column > score,
+        and_(score_column == score, id_column > row_id)
+    )
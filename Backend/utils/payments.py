@@ -0,0 +1,276 @@
+# app/utils/payments.py
+import hashlib
+import hmac
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, or_, update
+from app import db
+from app.config import Config
+from app.models import Order, Payment
+from utils.order_events import record_status_changes
+from utils.rollups import rollup_status_changes
+from utils.cache import invalidate_seller
+
+# Payment lifecycle: pending -> processing -> submitted -> completed / failed
+PAYMENT_PENDING = 'pending'
+PAYMENT_PROCESSING = 'processing'
+PAYMENT_SUBMITTED = 'submitted'
+PAYMENT_COMPLETED = 'completed'
+PAYMENT_FAILED = 'failed'
+
+
+class GatewayError(Exception):
+    """Raised by a gateway when a charge could not be submitted"""
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class PaymentGateway:
+    """
+    Interface for payment providers.
+
+    new_reference() names the payment before it is sent; the reference is stored
+    before charge() submits it, and is reused for retries so the provider can treat
+    it as an idempotency key. The final result arrives later through the callback
+    endpoint and parse_callback().
+    """
+    name = None
+    reference_prefix = 'PAY'
+
+    def new_reference(self, payment):
+        return f"{self.reference_prefix}-{uuid.uuid4().hex[:16].upper()}"
+
+    def charge(self, payment, timeout):
+        raise NotImplementedError
+
+    def parse_callback(self, payload):
+        """Return (reference, succeeded, message) from a verified callback payload"""
+        return payload['reference'], payload['status'] == 'success', payload.get('message')
+
+    def sign(self, body):
+        if not Config.PAYMENT_WEBHOOK_SECRET:
+            raise RuntimeError("PAYMENT_WEBHOOK_SECRET is not set")
+        secret = Config.PAYMENT_WEBHOOK_SECRET.encode('utf-8')
+        return hmac.new(secret, body, hashlib.sha256).hexdigest()
+
+    def verify_signature(self, body, signature):
+        # Without a secret nothing can be verified, so every callback is rejected
+        if not Config.PAYMENT_WEBHOOK_SECRET:
+            return False
+        return bool(signature) and hmac.compare_digest(self.sign(body), signature)
+
+
+class SimulatedGateway(PaymentGateway):
+    """
+    Local stand-in for M-Pesa, EVC, card and PayPill providers.
+    Accepts every charge and confirms it shortly afterwards, as a provider webhook would.
+    """
+    name = 'simulator'
+    reference_prefix = 'SIM'
+
+    def charge(self, payment, timeout):
+        app = current_app._get_current_object()
+        get_executor().submit(_simulate_confirmation, app, self.name, payment.transaction_id)
+
+
+GATEWAYS = {
+    SimulatedGateway.name: SimulatedGateway
+}
+
+
+def get_gateway(name):
+    gateway_class = GATEWAYS.get(name)
+    if not gateway_class:
+        raise ValueError(f"Unknown payment gateway: {name}")
+    return gateway_class()
+
+
+def gateway_for_method(payment_method):
+    """Gateway configured for a checkout payment method (card, mpesa, evc, paypill)"""
+    return get_gateway(Config.PAYMENT_GATEWAYS.get(payment_method, SimulatedGateway.name))
+
+
+# ===== Background execution =====
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=Config.PAYMENT_WORKERS,
+            thread_name_prefix='payments'
+        )
+    return _executor
+
+
+def submit_payment(payment_id):
+    """Queue a payment for processing; never blocks the calling request"""
+    app = current_app._get_current_object()
+    get_executor().submit(_run_in_app_context, app, process_payment, payment_id)
+
+
+def _run_in_app_context(app, func, *args):
+    with app.app_context():
+        try:
+            func(*args)
+        except Exception as e:
+            db.session.rollback()
+            app.logger.exception(f"Payment job failed: {e}")
+
+
+def _simulate_confirmation(app, gateway_name, reference):
+    time.sleep(Config.PAYMENT_SIMULATOR_DELAY_SECONDS)
+    _run_in_app_context(app, handle_callback, gateway_name, {
+        "reference": reference,
+        "status": "success"
+    })
+
+
+# ===== Payment stage =====
+
+def claim_payment(payment_id, stale_before=None):
+    """
+    Atomically move a payment from pending to processing so only one worker submits it.
+    With `stale_before`, a payment left in processing since before that time (its
+    worker died) can be claimed again. Returns True if this caller owns the payment.
+    """
+    claimable = Payment.status == PAYMENT_PENDING
+    if stale_before is not None:
+        claimable = or_(claimable, and_(
+            Payment.status == PAYMENT_PROCESSING,
+            Payment.updated_at < stale_before
+        ))
+    result = db.session.execute(
+        update(Payment)
+        .where(Payment.id == payment_id, claimable)
+        .values(status=PAYMENT_PROCESSING, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+
+def _mark_submitted(payment_id):
+    """processing -> submitted, unless a callback already settled the payment"""
+    db.session.execute(
+        update(Payment)
+        .where(Payment.id == payment_id, Payment.status == PAYMENT_PROCESSING)
+        .values(status=PAYMENT_SUBMITTED, last_error=None, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+
+def process_payment(payment_id, stale_before=None):
+    """
+    Submit a pending payment to its gateway, retrying transient errors with
+    a linear backoff. Runs in a worker thread.
+    """
+    if not claim_payment(payment_id, stale_before):
+        return
+
+    payment = db.session.get(Payment, payment_id)
+    gateway = gateway_for_method(payment.payment_method)
+
+    # The reference is committed before the gateway can confirm it, so the
+    # callback always finds the payment
+    if not payment.transaction_id:
+        payment.transaction_id = gateway.new_reference(payment)
+        db.session.commit()
+
+    while True:
+        payment.attempts = (payment.attempts or 0) + 1
+        db.session.commit()
+        try:
+            gateway.charge(payment, timeout=Config.PAYMENT_GATEWAY_TIMEOUT_SECONDS)
+        except GatewayError as e:
+            db.session.refresh(payment)
+            payment.last_error = str(e)[:255]
+            if not e.retryable or payment.attempts >= Config.PAYMENT_MAX_ATTEMPTS:
+                apply_payment_result(payment, False, str(e))
+                db.session.commit()
+                return
+            db.session.commit()
+            time.sleep(Config.PAYMENT_RETRY_BACKOFF_SECONDS * payment.attempts)
+            continue
+
+        _mark_submitted(payment_id)
+        return
+
+
+def apply_payment_result(payment, succeeded, message=None):
+    """
+    Record the final result of a payment and move its order on:
+    pending -> processing when paid, pending -> cancelled when the payment failed.
+    Safe to call more than once for the same payment. The caller commits.
+    """
+    if payment.status in (PAYMENT_COMPLETED, PAYMENT_FAILED):
+        return False
+
+    payment.status = PAYMENT_COMPLETED if succeeded else PAYMENT_FAILED
+    if not succeeded and message:
+        payment.last_error = message[:255]
+
+    # Guarded on pending, so a seller cancelling the order at the same time wins cleanly
+    new_status = 'processing' if succeeded else 'cancelled'
+    moved = db.session.execute(
+        update(Order)
+        .where(Order.id == payment.order_id, Order.status == 'pending')
+        .values(status=new_status, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session='fetch')
+    ).rowcount
+    if moved:
+        changes = [(payment.order_id, 'pending')]
+        record_status_changes(changes, new_status)
+        affected_sellers = rollup_status_changes(changes, new_status)
+        invalidate_seller(affected_sellers, 'order_stats', 'dashboard')
+    return True
+
+
+def handle_callback(gateway_name, payload):
+    """Apply a verified gateway callback. Returns False if the payment is unknown."""
+    gateway = get_gateway(gateway_name)
+    reference, succeeded, message = gateway.parse_callback(payload)
+
+    payment = Payment.query.filter_by(transaction_id=reference).first()
+    if not payment:
+        return False
+
+    apply_payment_result(payment, succeeded, message)
+    db.session.commit()
+    return True
+
+
+def sweep_payments():
+    """
+    Periodic clean-up for payments lost between stages:
+    - pending payments whose job never ran, and processing payments whose worker
+      died (e.g. the process restarted), are resubmitted with the same reference
+    - submitted payments without a callback within the timeout are failed
+    Returns (resubmitted, expired) counts.
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=Config.PAYMENT_RESUBMIT_AFTER_SECONDS)
+    stale_ids = [payment_id for (payment_id,) in db.session.query(Payment.id).filter(
+        Payment.status.in_([PAYMENT_PENDING, PAYMENT_PROCESSING]),
+        Payment.updated_at < stale_before
+    ).all()]
+    for payment_id in stale_ids:
+        process_payment(payment_id, stale_before=stale_before)
+
+    expired = Payment.query.filter(
+        Payment.status == PAYMENT_SUBMITTED,
+        Payment.updated_at < now - timedelta(seconds=Config.PAYMENT_TIMEOUT_SECONDS)
+    ).all()
+    for payment in expired:
+        apply_payment_result(payment, False, "Payment was not confirmed in time")
+    db.session.commit()
+
+    return len(stale_ids), len(expired)
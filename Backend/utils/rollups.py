@@ -0,0 +1,433 @@
+# app/utils/rollups.py
+from datetime import date, datetime, timedelta
+from sqlalchemy import delete, insert, select, func, and_, case, exists
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects import postgresql, sqlite
+from app import db
+from app.config import Config
+from app.models import Order, OrderItem, Product, User, SellerDailyStat, SellerBuyer, PlatformDailyStat
+from utils.analytics import day_bucket, dialect_name
+
+# Order statuses whose revenue is earned, and whose seller payout is still outstanding
+COMPLETED_ORDER_STATUSES = ['delivered', 'completed']
+PENDING_PAYOUT_STATUSES = ['pending', 'processing', 'shipped']
+
+# Order status -> platform_daily_stats count column
+PLATFORM_STATUS_COLUMNS = {
+    'pending': 'pending_orders',
+    'processing': 'processing_orders',
+    'shipped': 'shipped_orders',
+    'delivered': 'delivered_orders',
+    'cancelled': 'cancelled_orders'
+}
+
+
+def _seller_day_select(condition):
+    """Grouped seller/day/status aggregate over the order lines matching condition"""
+    day = day_bucket(Order.created_at)
+    return select(
+        Product.seller_id,
+        day,
+        Order.status,
+        func.sum(OrderItem.price * OrderItem.quantity),
+        func.count(func.distinct(Order.id)),
+        func.sum(OrderItem.quantity)
+    ).select_from(Order).join(
+        OrderItem, OrderItem.order_id == Order.id
+    ).join(
+        Product, OrderItem.product_id == Product.id
+    ).where(condition).group_by(Product.seller_id, day, Order.status)
+
+
+SELLER_DAY_COLUMNS = ['seller_id', 'day', 'status', 'revenue', 'orders', 'items']
+
+
+def _next_month(day):
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def _month_chunks(start, end):
+    """Split [start, end) at calendar month boundaries, so each backfill transaction stays small"""
+    chunk_start = start
+    while chunk_start < end:
+        chunk_end = min(_next_month(chunk_start), end)
+        yield chunk_start, chunk_end
+        chunk_start = chunk_end
+
+
+def _dialect_insert():
+    return postgresql.insert if dialect_name() == 'postgresql' else sqlite.insert
+
+
+def _as_date(value):
+    # SQLite returns date() as 'YYYY-MM-DD' text, PostgreSQL as a date
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def _bump(deltas, key, **amounts):
+    row = deltas.setdefault(key, {})
+    for column, amount in amounts.items():
+        row[column] = row.get(column, 0) + amount
+
+
+def _add_to_rollup(model, key_columns, deltas):
+    """
+    Add {key: {column: delta}} onto the rollup rows with those keys in one
+    INSERT ... ON CONFLICT DO UPDATE SET column = column + excluded.column, creating
+    rows that do not exist yet. Concurrent writers add to the same row rather than
+    rebuilding it, and keys are written in sorted order so they lock rows in the same order.
+    """
+    if not deltas:
+        return
+
+    value_columns = [column.name for column in model.__table__.columns if column.name not in key_columns]
+    rows = []
+    for key in sorted(deltas):
+        row = dict.fromkeys(value_columns, 0)
+        row.update(deltas[key])
+        row.update(zip(key_columns, key))
+        rows.append(row)
+
+    stmt = _dialect_insert()(model).values(rows)
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={column: getattr(model, column) + stmt.excluded[column] for column in value_columns}
+    ))
+
+
+def _order_seller_lines(order_ids):
+    """
+    One row per order and seller: (order id, buyer id, placed at, seller id, revenue, units).
+    Orders without items, or with lines whose product is gone, get a row with seller id None.
+    """
+    return db.session.query(
+        Order.id,
+        Order.user_id,
+        Order.created_at,
+        Product.seller_id,
+        func.coalesce(func.sum(OrderItem.price * OrderItem.quantity), 0),
+        func.coalesce(func.sum(OrderItem.quantity), 0)
+    ).select_from(Order).outerjoin(
+        OrderItem, OrderItem.order_id == Order.id
+    ).outerjoin(
+        Product, OrderItem.product_id == Product.id
+    ).filter(
+        Order.id.in_(list(order_ids)),
+        Order.created_at.isnot(None)
+    ).group_by(Order.id, Order.user_id, Order.created_at, Product.seller_id).all()
+
+
+def _seller_day_deltas(lines, changes):
+    """
+    seller_daily_stats deltas for orders moving between statuses, given their lines and
+    {order_id: (from_status or None for a new order, to_status)}: revenue, orders and
+    units move from the old status row to the new one.
+    """
+    deltas = {}
+    for order_id, _, placed_at, seller_id, revenue, units in lines:
+        if seller_id is None:
+            continue
+        day = placed_at.date()
+        from_status, to_status = changes[order_id]
+        if from_status:
+            _bump(deltas, (seller_id, day, from_status), revenue=-revenue, orders=-1, items=-units)
+        _bump(deltas, (seller_id, day, to_status), revenue=revenue, orders=1, items=units)
+    return deltas
+
+
+def _platform_status_delta(deltas, day, status, revenue, sign):
+    amounts = {}
+    if status in PLATFORM_STATUS_COLUMNS:
+        amounts[PLATFORM_STATUS_COLUMNS[status]] = sign
+    if status in COMPLETED_ORDER_STATUSES:
+        amounts['completed_revenue'] = sign * revenue
+    if status in PENDING_PAYOUT_STATUSES:
+        amounts['pending_revenue'] = sign * revenue
+    _bump(deltas, (day,), **amounts)
+
+
+def _platform_day_deltas(lines, changes):
+    """
+    platform_daily_stats deltas for the orders in `changes` (see _seller_day_deltas).
+
+    New orders add their totals; a status change only moves the order between the
+    status counts and the completed/pending revenue. month_buyers counts distinct
+    buyers, so for new orders one grouped query finds the days on which their
+    buyers already ordered that month.
+    """
+    orders = {}
+    for order_id, buyer_id, placed_at, _, revenue, _ in lines:
+        order = orders.setdefault(order_id, {'buyer_id': buyer_id, 'day': placed_at.date(), 'revenue': 0})
+        order['revenue'] += revenue
+
+    deltas = {}
+    new_orders = []
+    for order_id, order in orders.items():
+        from_status, to_status = changes[order_id]
+        day, revenue = order['day'], order['revenue']
+        if from_status:
+            _platform_status_delta(deltas, day, from_status, revenue, -1)
+        else:
+            _bump(deltas, (day,), orders=1, revenue=revenue, fees=revenue * Config.PLATFORM_FEE_RATE)
+            if order['buyer_id'] is not None:
+                new_orders.append((order['buyer_id'], day))
+        _platform_status_delta(deltas, day, to_status, revenue, 1)
+
+    if not new_orders:
+        return deltas
+
+    days = sorted(day for _, day in new_orders)
+    order_day = day_bucket(Order.created_at)
+    earlier_days = {}
+    for buyer_id, day in db.session.query(Order.user_id, order_day).filter(
+        Order.user_id.in_({buyer_id for buyer_id, _ in new_orders}),
+        Order.created_at >= datetime(days[0].year, days[0].month, 1),
+        Order.created_at < datetime.combine(_next_month(days[-1]), datetime.min.time()),
+        Order.id.notin_(list(changes))
+    ).distinct():
+        earlier_days.setdefault(buyer_id, set()).add(_as_date(day))
+
+    # A buyer counts towards month_buyers on the day of their first order of the
+    # month, which a new order can move earlier
+    firsts = {}
+    for buyer_id, day in set(new_orders):
+        month = (buyer_id, day.year, day.month)
+        firsts[month] = min(firsts.get(month, day), day)
+    for (buyer_id, year, month), day in firsts.items():
+        previous = min((d for d in earlier_days.get(buyer_id, ()) if (d.year, d.month) == (year, month)), default=None)
+        if previous is None or day < previous:
+            _bump(deltas, (day,), month_buyers=1)
+            if previous is not None:
+                _bump(deltas, (previous,), month_buyers=-1)
+    return deltas
+
+
+def _apply_order_changes(changes):
+    lines = _order_seller_lines(changes)
+    _add_to_rollup(SellerDailyStat, ['seller_id', 'day', 'status'], _seller_day_deltas(lines, changes))
+    _add_to_rollup(PlatformDailyStat, ['day'], _platform_day_deltas(lines, changes))
+    return {seller_id for _, _, _, seller_id, _, _ in lines if seller_id is not None}
+
+
+def rollup_new_orders(order_ids):
+    """
+    Add newly placed (flushed) orders to the rollups. Call it in the same transaction
+    as the checkout, before committing. Returns the ids of the sellers whose figures changed.
+    """
+    if not order_ids:
+        return set()
+    changes = {
+        order_id: (None, status)
+        for order_id, status in db.session.query(Order.id, Order.status).filter(Order.id.in_(list(order_ids)))
+    }
+    return _apply_order_changes(changes)
+
+
+def rollup_status_changes(changes, to_status):
+    """
+    Move orders between status rows of the rollups, given (order_id, from_status)
+    pairs as for record_status_changes(). The from status must be the one the
+    caller's guarded UPDATE replaced. Call it in the same transaction as the change,
+    before committing. Returns the ids of the sellers whose figures changed.
+    """
+    changes = {order_id: (from_status, to_status) for order_id, from_status in changes}
+    if not changes:
+        return set()
+    return _apply_order_changes(changes)
+
+
+def backfill_seller_stats(start=None, end=None):
+    """
+    Rebuild seller_daily_stats for orders placed in [start, end) (all history when
+    omitted), one month at a time so each transaction stays small.
+    Returns the number of rollup rows written.
+    """
+    if start is None:
+        start = db.session.query(func.min(Order.created_at)).scalar()
+        if start is None:
+            return 0
+    if end is None:
+        end = datetime.utcnow() + timedelta(days=1)
+
+    start = datetime(start.year, start.month, start.day)
+    end = datetime(end.year, end.month, end.day)
+
+    written = 0
+    for chunk_start, chunk_end in _month_chunks(start, end):
+        db.session.execute(delete(SellerDailyStat).where(
+            SellerDailyStat.day >= chunk_start.date(),
+            SellerDailyStat.day < chunk_end.date()
+        ))
+        result = db.session.execute(insert(SellerDailyStat).from_select(
+            SELLER_DAY_COLUMNS,
+            _seller_day_select(and_(Order.created_at >= chunk_start, Order.created_at < chunk_end))
+        ))
+        written += result.rowcount or 0
+        db.session.commit()
+
+    return written
+
+
+def _platform_day_rows(start, end):
+    """
+    platform_daily_stats rows for [start, end), which must lie within one calendar
+    month: one grouped query each for the orders, the month's first-time buyers
+    and the registrations of every day in the range.
+    """
+    rows = {}
+
+    def row(day):
+        day = _as_date(day)
+        if day not in rows:
+            rows[day] = {column.name: 0 for column in PlatformDailyStat.__table__.columns}
+            rows[day]['day'] = day
+        return rows[day]
+
+    # Orders without items still count as orders, so order lines are outer-joined
+    day = day_bucket(Order.created_at)
+    line_total = OrderItem.price * OrderItem.quantity
+    status_counts = [
+        func.count(func.distinct(case((Order.status == status, Order.id)))).label(column)
+        for status, column in PLATFORM_STATUS_COLUMNS.items()
+    ]
+    for result in db.session.execute(select(
+        day.label('day'),
+        func.count(func.distinct(Order.id)).label('orders'),
+        func.coalesce(func.sum(line_total), 0).label('revenue'),
+        func.coalesce(func.sum(case((Order.status.in_(COMPLETED_ORDER_STATUSES), line_total))), 0).label('completed_revenue'),
+        func.coalesce(func.sum(case((Order.status.in_(PENDING_PAYOUT_STATUSES), line_total))), 0).label('pending_revenue'),
+        *status_counts
+    ).select_from(Order).outerjoin(
+        OrderItem, OrderItem.order_id == Order.id
+    ).where(
+        Order.created_at >= start, Order.created_at < end
+    ).group_by(day)).mappings():
+        values = row(result['day'])
+        values.update({key: value for key, value in result.items() if key != 'day'})
+        values['fees'] = values['revenue'] * Config.PLATFORM_FEE_RATE
+
+    # A buyer counts on the day of their first order of the month: no earlier order
+    # since the start of the month, found through ix_orders_user_id_created_at
+    earlier = aliased(Order)
+    month_start = datetime(start.year, start.month, 1)
+    for result_day, count in db.session.execute(select(
+        day, func.count(func.distinct(Order.user_id))
+    ).where(
+        Order.created_at >= start,
+        Order.created_at < end,
+        Order.user_id.isnot(None),
+        ~exists().where(
+            earlier.user_id == Order.user_id,
+            earlier.created_at >= month_start,
+            earlier.created_at < day
+        )
+    ).group_by(day)):
+        row(result_day)['month_buyers'] = count
+
+    registered = day_bucket(User.created_at)
+    for result_day, count in db.session.execute(select(
+        registered, func.count(User.id)
+    ).where(
+        User.created_at >= start, User.created_at < end
+    ).group_by(registered)):
+        row(result_day)['new_users'] = count
+
+    return list(rows.values())
+
+
+def _write_platform_days(start, end):
+    db.session.execute(delete(PlatformDailyStat).where(
+        PlatformDailyStat.day >= start.date(),
+        PlatformDailyStat.day < end.date()
+    ))
+    rows = _platform_day_rows(start, end)
+    if rows:
+        db.session.execute(insert(PlatformDailyStat), rows)
+    return len(rows)
+
+
+def rollup_new_users(day, count=1):
+    """Count new registrations on platform_daily_stats for `day`. The caller commits."""
+    _add_to_rollup(PlatformDailyStat, ['day'], {(day,): {'new_users': count}})
+
+
+def backfill_platform_stats(start=None, end=None):
+    """
+    Rebuild platform_daily_stats for [start, end) (all history when omitted),
+    one month at a time so each transaction stays small.
+    Returns the number of rollup rows written.
+    """
+    if start is None:
+        firsts = [
+            value for value in (
+                db.session.query(func.min(Order.created_at)).scalar(),
+                db.session.query(func.min(User.created_at)).scalar()
+            ) if value is not None
+        ]
+        if not firsts:
+            return 0
+        start = min(value.replace(tzinfo=None) for value in firsts)
+    if end is None:
+        end = datetime.utcnow() + timedelta(days=1)
+
+    start = datetime(start.year, start.month, start.day)
+    end = datetime(end.year, end.month, end.day)
+
+    written = 0
+    for chunk_start, chunk_end in _month_chunks(start, end):
+        written += _write_platform_days(chunk_start, chunk_end)
+        db.session.commit()
+
+    return written
+
+
+def record_seller_buyers(buyer_id, seller_ids, ordered_at):
+    """
+    Upsert the seller_buyers rows for a new order: the first row for a pair
+    records the first purchase, later orders bump last_order_at and order_count.
+    One statement per checkout; the caller commits.
+    """
+    if not seller_ids:
+        return
+
+    stmt = _dialect_insert()(SellerBuyer).values([
+        {
+            'seller_id': seller_id,
+            'buyer_id': buyer_id,
+            'first_order_at': ordered_at,
+            'last_order_at': ordered_at,
+            'order_count': 1
+        }
+        for seller_id in sorted(seller_ids)
+    ])
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=[SellerBuyer.seller_id, SellerBuyer.buyer_id],
+        set_={
+            'last_order_at': stmt.excluded.last_order_at,
+            'order_count': SellerBuyer.order_count + 1
+        }
+    ))
+
+
+def backfill_seller_buyers():
+    """Rebuild seller_buyers from the full order history. Returns the number of rows written."""
+    db.session.execute(delete(SellerBuyer))
+    result = db.session.execute(insert(SellerBuyer).from_select(
+        ['seller_id', 'buyer_id', 'first_order_at', 'last_order_at', 'order_count'],
+        select(
+            Product.seller_id,
+            Order.user_id,
+            func.min(Order.created_at),
+            func.max(Order.created_at),
+            func.count(func.distinct(Order.id))
+        ).select_from(Order).join(
+            OrderItem, OrderItem.order_id == Order.id
+        ).join(
+            Product, OrderItem.product_id == Product.id
+        ).where(
+            Order.user_id.isnot(None),
+            Order.created_at.isnot(None)
+        ).group_by(Product.seller_id, Order.user_id)
+    ))
+    db.session.commit()
+    return result.rowcount or 0
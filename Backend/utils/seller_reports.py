@@ -0,0 +1,558 @@
+# app/utils/seller_reports.py
+from datetime import date, datetime
+from sqlalchemy import case, func
+from app import db
+from app.config import Config
+from app.models import Order, OrderItem, User, Product, Notification, SellerDailyStat, SellerBuyer
+from utils.analytics import (
+    time_bucket, series_buckets, last_n_months, comparison_windows, window_case, percent_change
+)
+from utils.cache import seller_key, get_or_compute
+
+# Payloads served by /seller/overview, in response order
+SELLER_REPORTS = ['dashboard', 'analytics', 'earnings']
+
+DASHBOARD_CATEGORIES = ['clothes', 'cosmetics', 'electronics', 'sports']
+
+# Buyer segments by orders placed with the seller
+BUYER_SEGMENTS = ['1 order', '2-3 orders', '4-9 orders', '10+ orders']
+
+# Statuses counted as earned and as not yet paid out
+EARNING_STATUSES = ['delivered', 'processing', 'shipped']
+PENDING_STATUSES = ['pending', 'processing', 'shipped']
+
+
+def _empty_totals():
+    return {"revenue": 0.0, "earned": 0.0, "pending": 0.0, "completed": 0.0, "orders": 0, "cancelled": 0}
+
+
+class SellerAggregates:
+    """
+    Order aggregates shared by the dashboard, analytics and earnings payloads.
+    Each aggregate is computed on first use and reused by every payload built
+    from the same instance, so one request never runs the same query twice.
+    """
+
+    def __init__(self, seller_id, time_range='monthly', now=None):
+        self.seller_id = seller_id
+        self.time_range = time_range
+        self.now = now or datetime.utcnow()
+        self.previous_start, self.current_start, _ = comparison_windows(time_range, self.now)
+        self.unit, self.series_start, self.series_keys, self.series_labels = series_buckets(time_range, self.now)
+        self._rollup = None
+        self._buyers = None
+
+    @property
+    def rollup(self):
+        """Order and revenue totals from one grouped pass over seller_daily_stats"""
+        if self._rollup is None:
+            self._rollup = self._compute_rollup()
+        return self._rollup
+
+    @property
+    def buyers(self):
+        """Distinct buyers overall, in the current window and in the previous window"""
+        if self._buyers is None:
+            self._buyers = self._compute_buyers()
+        return self._buyers
+
+    def _compute_rollup(self):
+        previous_month, current_month = last_n_months(2, self.now)
+
+        # Bucketed by chart bucket, status, comparison window and calendar month
+        # (this / last / older); every total is derived from this result set
+        bucket = time_bucket(SellerDailyStat.day, self.unit)
+        window = window_case(SellerDailyStat.day, self.current_start, self.previous_start)
+        month = case(
+            (SellerDailyStat.day >= date(*current_month, 1), 'this'),
+            (SellerDailyStat.day >= date(*previous_month, 1), 'last'),
+            else_='older'
+        )
+        rows = db.session.query(
+            bucket.label('bucket'),
+            SellerDailyStat.status,
+            window.label('window'),
+            month.label('month'),
+            func.sum(SellerDailyStat.revenue).label('revenue'),
+            func.sum(SellerDailyStat.orders).label('orders')
+        ).filter(
+            SellerDailyStat.seller_id == self.seller_id
+        ).group_by(bucket, SellerDailyStat.status, window, month).all()
+
+        totals = _empty_totals()
+        windows = {name: _empty_totals() for name in ('current', 'previous', 'earlier')}
+        months = {name: 0.0 for name in ('this', 'last', 'older')}
+        buckets = {}
+
+        for row in rows:
+            revenue = float(row.revenue or 0)
+            orders = int(row.orders or 0)
+            in_bucket = buckets.setdefault(row.bucket, _empty_totals())
+
+            for target in (totals, windows[row.window], in_bucket):
+                target["revenue"] += revenue
+                target["orders"] += orders
+                if row.status in EARNING_STATUSES:
+                    target["earned"] += revenue
+                if row.status in PENDING_STATUSES:
+                    target["pending"] += revenue
+                if row.status == 'delivered':
+                    target["completed"] += revenue
+                if row.status == 'cancelled':
+                    target["cancelled"] += orders
+
+            if row.status in EARNING_STATUSES:
+                months[row.month] += revenue
+
+        return {"totals": totals, "windows": windows, "months": months, "buckets": buckets}
+
+    def _compute_buyers(self):
+        # Everyone who ever bought from the seller has one seller_buyers row; the
+        # window counts only read orders placed since the start of the previous window
+        total = db.session.query(func.count(SellerBuyer.buyer_id)).filter(
+            SellerBuyer.seller_id == self.seller_id
+        ).scalar()
+        previous_start_at = datetime.combine(self.previous_start, datetime.min.time())
+        current_start_at = datetime.combine(self.current_start, datetime.min.time())
+        row = db.session.query(
+            func.count(func.distinct(case((Order.created_at >= current_start_at, Order.user_id)))),
+            func.count(func.distinct(case((Order.created_at < current_start_at, Order.user_id))))
+        ).join(OrderItem).join(Product).filter(
+            Product.seller_id == self.seller_id,
+            Order.created_at >= previous_start_at
+        ).one()
+        return {"all": total, "current": row[0], "previous": row[1]}
+
+    def series(self, field):
+        """Dense per-bucket series of a rollup total for the selected range, oldest first"""
+        buckets = self.rollup["buckets"]
+        return [buckets[key][field] if key in buckets else 0 for key in self.series_keys]
+
+
+# ===== Dashboard =====
+
+def compute_dashboard_summary(aggregates):
+    """The cached part of the seller dashboard: product counts and order totals"""
+    seller_id = aggregates.seller_id
+
+    # Get product counts by category (using lowercase to match database)
+    category_counts = dict(db.session.query(
+        Product.category, func.count(Product.id)
+    ).filter(
+        Product.seller_id == seller_id,
+        Product.category.in_(DASHBOARD_CATEGORIES)
+    ).group_by(Product.category).all())
+    product_counts = {category: category_counts.get(category, 0) for category in DASHBOARD_CATEGORIES}
+    product_counts['total'] = sum(product_counts.values())
+
+    # Revenue counts delivered orders only
+    totals = aggregates.rollup["totals"]
+    return {
+        "product_counts": product_counts,
+        "order_stats": {
+            "total_orders": totals["orders"],
+            "total_revenue": totals["completed"],
+            "customers_count": aggregates.buyers["all"]
+        }
+    }
+
+
+def format_time_ago(date):
+    """Human readable age of a timestamp, e.g. '3 hours ago'"""
+    time_diff = datetime.utcnow() - date
+    if time_diff.days > 0:
+        return f"{time_diff.days} day{'s' if time_diff.days > 1 else ''} ago"
+    elif time_diff.seconds > 3600:
+        hours = time_diff.seconds // 3600
+        return f"{hours} hour{'s' if hours > 1 else ''} ago"
+    elif time_diff.seconds > 60:
+        minutes = time_diff.seconds // 60
+        return f"{minutes} min ago"
+    return "Just now"
+
+
+def build_dashboard(aggregates):
+    """
+    Seller dashboard payload; the aggregates are cached until the seller's data changes.
+    Notifications are read on every request: they are also written by other processes
+    (e.g. `flask scan-low-stock`), whose invalidations cannot reach this process's cache.
+    """
+    summary = get_or_compute(
+        seller_key(aggregates.seller_id, 'dashboard'),
+        lambda: compute_dashboard_summary(aggregates),
+        timeout=Config.SELLER_DASHBOARD_TTL
+    )
+
+    # Get recent activities (last 10 notifications)
+    recent_notifications = Notification.query.filter_by(target_user=aggregates.seller_id).order_by(
+        Notification.date.desc()
+    ).limit(10).all()
+
+    # Format recent activities; the age is computed on every request
+    recent_activities = []
+    for notif in recent_notifications:
+        recent_activities.append({
+            "id": notif.id,
+            "type": notif.type,
+            "title": notif.title,
+            "message": notif.message,
+            "time_ago": format_time_ago(notif.date),
+            "read": notif.read
+        })
+
+    return {
+        "product_counts": summary["product_counts"],
+        "order_stats": summary["order_stats"],
+        "recent_activities": recent_activities
+    }
+
+
+# ===== Analytics =====
+
+def build_analytics(aggregates):
+    """Seller analytics payload for the aggregates' time range"""
+    seller_id = aggregates.seller_id
+    series_keys = aggregates.series_keys
+    series_start_at = datetime.combine(aggregates.series_start, datetime.min.time())
+
+    # Revenue (from all orders, not just delivered) and orders, current window against the previous one
+    current, previous = aggregates.rollup["windows"]["current"], aggregates.rollup["windows"]["previous"]
+    total_revenue, previous_revenue = current["revenue"], previous["revenue"]
+    total_orders, previous_orders = current["orders"], previous["orders"]
+
+    # Calculate average order value
+    avg_order_value = total_revenue / total_orders if total_orders > 0 else 0.0
+    previous_avg_order_value = previous_revenue / previous_orders if previous_orders > 0 else 0.0
+
+    # Calculate conversion rate (simplified - orders vs unique customers)
+    buyers = aggregates.buyers
+    conversion_rate = (buyers["current"] / total_orders * 100) if total_orders > 0 else 0.0
+    previous_conversion_rate = (buyers["previous"] / previous_orders * 100) if previous_orders > 0 else 0.0
+
+    # Dense chart series for the selected range; empty buckets are zero
+    revenue_data = aggregates.series("revenue")
+    orders_data = aggregates.series("orders")
+
+    # Get top buyers
+    top_buyers_query = db.session.query(
+        Order.user_id,
+        User.firstname,
+        User.secondname,
+        User.email,
+        func.count(func.distinct(Order.id)).label('order_count'),
+        func.sum(OrderItem.price * OrderItem.quantity).label('total_value')
+    ).join(OrderItem).join(Product).join(User, Order.user_id == User.id).filter(
+        Product.seller_id == seller_id
+    ).group_by(Order.user_id, User.firstname, User.secondname, User.email).order_by(
+        func.sum(OrderItem.price * OrderItem.quantity).desc()
+    ).limit(5).all()
+
+    top_buyers = []
+    for buyer in top_buyers_query:
+        top_buyers.append({
+            "name": f"{buyer.firstname} {buyer.secondname}",
+            "email": buyer.email,
+            "purchases": buyer.order_count,
+            "value": float(buyer.total_value) if buyer.total_value else 0,
+            "location": "N/A"  # Add location field to user model if needed
+        })
+
+    # Get sales by category
+    category_sales = db.session.query(
+        Product.category,
+        func.sum(OrderItem.price * OrderItem.quantity).label('total_sales'),
+        func.count(OrderItem.id).label('item_count')
+    ).join(OrderItem).join(Order).filter(
+        Product.seller_id == seller_id
+    ).group_by(Product.category).all()
+
+    purchase_categories = []
+    total_category_sales = sum(float(sale.total_sales) for sale in category_sales if sale.total_sales)
+
+    for category in category_sales:
+        if category.total_sales:
+            percentage = (float(category.total_sales) / total_category_sales * 100) if total_category_sales > 0 else 0
+            purchase_categories.append({
+                "category": category.category.title(),
+                "percentage": round(percentage, 1),
+                "value": float(category.total_sales)
+            })
+
+    # New buyers per bucket: range count over the seller's first purchases
+    first_bucket = time_bucket(SellerBuyer.first_order_at, aggregates.unit)
+    new_by_bucket = dict(db.session.query(
+        first_bucket, func.count()
+    ).filter(
+        SellerBuyer.seller_id == seller_id,
+        SellerBuyer.first_order_at >= series_start_at
+    ).group_by(first_bucket).all())
+
+    # Active buyers per bucket; everyone active who is not new in that bucket is returning
+    order_bucket = time_bucket(Order.created_at, aggregates.unit)
+    active_by_bucket = dict(db.session.query(
+        order_bucket, func.count(func.distinct(Order.user_id))
+    ).join(OrderItem).join(Product).filter(
+        Product.seller_id == seller_id,
+        Order.created_at >= series_start_at
+    ).group_by(order_bucket).all())
+
+    new_buyers = [new_by_bucket.get(key, 0) for key in series_keys]
+    returning_buyers = [
+        max(0, active_by_bucket.get(key, 0) - new_by_bucket.get(key, 0)) for key in series_keys
+    ]
+
+    # Buyer segments by number of orders placed with this seller
+    segment = case(
+        (SellerBuyer.order_count == 1, BUYER_SEGMENTS[0]),
+        (SellerBuyer.order_count <= 3, BUYER_SEGMENTS[1]),
+        (SellerBuyer.order_count <= 9, BUYER_SEGMENTS[2]),
+        else_=BUYER_SEGMENTS[3]
+    )
+    segment_counts = dict(db.session.query(segment, func.count()).filter(
+        SellerBuyer.seller_id == seller_id
+    ).group_by(segment).all())
+    segmented_buyers = sum(segment_counts.values())
+
+    buyer_demographics = []
+    for name in BUYER_SEGMENTS:
+        count = segment_counts.get(name, 0)
+        buyer_demographics.append({
+            "segment": name,
+            "ageGroup": name,  # label key read by the analytics page
+            "percentage": round(count / segmented_buyers * 100, 1) if segmented_buyers else 0,
+            "value": count
+        })
+
+    return {
+        "totalRevenue": {
+            "current": total_revenue,
+            "previous": previous_revenue,
+            "change": percent_change(total_revenue, previous_revenue),
+            "data": revenue_data
+        },
+        "totalOrders": {
+            "current": total_orders,
+            "previous": previous_orders,
+            "change": percent_change(total_orders, previous_orders),
+            "data": orders_data
+        },
+        "averageOrderValue": {
+            "current": avg_order_value,
+            "previous": previous_avg_order_value,
+            "change": percent_change(avg_order_value, previous_avg_order_value),
+            "data": [
+                revenue_data[i] / orders_data[i] if orders_data[i] else 0
+                for i in range(len(orders_data))
+            ]
+        },
+        "conversionRate": {
+            "current": conversion_rate,
+            "previous": previous_conversion_rate,
+            "change": percent_change(conversion_rate, previous_conversion_rate),
+            "data": [conversion_rate] * len(series_keys)  # Per-bucket conversion needs per-bucket distinct buyers
+        },
+        "buyerDemographics": buyer_demographics,
+        "topBuyers": top_buyers,
+        "purchaseCategories": purchase_categories,
+        "buyerActivity": {
+            "labels": aggregates.series_labels,
+            "newBuyers": new_buyers,
+            "returningBuyers": returning_buyers
+        }
+    }
+
+
+# ===== Earnings =====
+
+def build_earnings(aggregates):
+    """Seller earnings payload for the aggregates' time range"""
+    seller_id = aggregates.seller_id
+    rollup = aggregates.rollup
+    totals = rollup["totals"]
+    total_orders = totals["orders"]
+
+    # Dense earnings and orders series for the selected range, oldest first
+    series_earnings = aggregates.series("earned")
+    series_orders = aggregates.series("orders")
+
+    # Get recent transactions (last 10)
+    recent_transactions = db.session.query(
+        Order.id,
+        Order.order_number,
+        Order.created_at,
+        Order.status,
+        User.firstname,
+        User.secondname,
+        func.sum(OrderItem.price * OrderItem.quantity).label('order_total')
+    ).join(OrderItem).join(Product).join(User, Order.user_id == User.id).filter(
+        Product.seller_id == seller_id
+    ).group_by(
+        Order.id, Order.order_number, Order.created_at, Order.status,
+        User.firstname, User.secondname
+    ).order_by(Order.created_at.desc()).limit(10).all()
+
+    transactions = []
+    for transaction in recent_transactions:
+        transactions.append({
+            "id": f"#ORD-{transaction.id}",
+            "customer": f"{transaction.firstname} {transaction.secondname}",
+            "date": transaction.created_at.strftime('%Y-%m-%d') if transaction.created_at else "N/A",
+            "amount": float(transaction.order_total) if transaction.order_total else 0.0,
+            "status": "completed" if transaction.status == "delivered" else
+                     "pending" if transaction.status in ["pending", "processing", "shipped"] else "failed"
+        })
+
+    # Calculate average order value
+    avg_order_value = totals["earned"] / total_orders if total_orders > 0 else 0.0
+
+    # Calculate conversion rate (orders vs unique customers)
+    buyers = aggregates.buyers
+    conversion_rate = (buyers["all"] / total_orders * 100) if total_orders > 0 else 0.0
+
+    # Calculate refund rate (cancelled orders)
+    refund_rate = (totals["cancelled"] / total_orders * 100) if total_orders > 0 else 0.0
+
+    # Period-over-period changes: the current window against the one before it
+    current, previous = rollup["windows"]["current"], rollup["windows"]["previous"]
+
+    def window_rates(period, period_customers):
+        orders = period["orders"]
+        return (
+            period["earned"] / orders if orders else 0.0,
+            period_customers / orders * 100 if orders else 0.0,
+            period["cancelled"] / orders * 100 if orders else 0.0
+        )
+
+    current_aov, current_conversion, current_refunds = window_rates(current, buyers["current"])
+    previous_aov, previous_conversion, previous_refunds = window_rates(previous, buyers["previous"])
+
+    return {
+        "totalEarnings": {
+            "current": totals["earned"],
+            "growth": percent_change(current["earned"], previous["earned"]),
+            "data": series_earnings
+        },
+        "thisMonth": {
+            "current": rollup["months"]["this"],
+            "growth": percent_change(rollup["months"]["this"], rollup["months"]["last"])
+        },
+        "pending": {
+            "current": totals["pending"],
+            "change": percent_change(current["pending"], previous["pending"])
+        },
+        "completed": {
+            "current": totals["completed"],
+            "growth": percent_change(current["completed"], previous["completed"])
+        },
+        "earningsData": [
+            {
+                "month": label,  # bucket label; a month name for the monthly range
+                "period": key,
+                "earnings": series_earnings[i],
+                "orders": series_orders[i]
+            }
+            for i, (key, label) in enumerate(zip(aggregates.series_keys, aggregates.series_labels))
+        ],
+        "recentTransactions": transactions,
+        "performanceMetrics": {
+            "averageOrderValue": {
+                "current": avg_order_value,
+                "change": percent_change(current_aov, previous_aov)
+            },
+            "conversionRate": {
+                "current": conversion_rate,
+                "change": percent_change(current_conversion, previous_conversion)
+            },
+            "refundRate": {
+                "current": refund_rate,
+                "change": percent_change(current_refunds, previous_refunds)  # Negative is good for refunds
+            }
+        }
+    }
+
+
+# ===== Product performance =====
+
+PRODUCT_SORTS = ['units_sold', 'revenue', 'orders', 'days_of_stock', 'stock', 'name']
+
+
+def product_performance(seller_id, start, end, sort='revenue', direction='desc', page=1, per_page=20):
+    """
+    Units sold, revenue, order count and days of stock left for one page of the
+    seller's products, over orders placed in [start, end) and not cancelled.
+
+    The seller's sales are grouped per product in a derived table, left-joined
+    to the products so unsold ones are listed too. The total is a separate count
+    of the seller's products, so pages past the end still report it. Returns (rows, total).
+    """
+    window_days = max((end - start).days, 1)
+
+    sales = db.session.query(
+        OrderItem.product_id.label('product_id'),
+        func.sum(OrderItem.quantity).label('units_sold'),
+        func.sum(OrderItem.price * OrderItem.quantity).label('revenue'),
+        func.count(func.distinct(OrderItem.order_id)).label('orders')
+    ).join(Order, OrderItem.order_id == Order.id).join(
+        Product, OrderItem.product_id == Product.id
+    ).filter(
+        Product.seller_id == seller_id,
+        Order.created_at >= start,
+        Order.created_at < end,
+        Order.status != 'cancelled'
+    ).group_by(OrderItem.product_id).subquery()
+
+    units_sold = func.coalesce(sales.c.units_sold, 0)
+    # Stock divided by the average daily units sold over the window; NULL when nothing sold
+    days_of_stock = func.coalesce(Product.stock, 0) * window_days / func.nullif(sales.c.units_sold * 1.0, 0)
+    columns = {
+        'units_sold': units_sold,
+        'revenue': func.coalesce(sales.c.revenue, 0),
+        'orders': func.coalesce(sales.c.orders, 0),
+        'days_of_stock': days_of_stock,
+        'stock': Product.stock,
+        'name': Product.name
+    }
+
+    sort_column = columns[sort]
+    sort_column = sort_column.asc() if direction == 'asc' else sort_column.desc()
+
+    rows = db.session.query(
+        Product.id,
+        Product.name,
+        Product.category,
+        Product.price,
+        Product.stock,
+        columns['units_sold'].label('units_sold'),
+        columns['revenue'].label('revenue'),
+        columns['orders'].label('orders'),
+        days_of_stock.label('days_of_stock')
+    ).outerjoin(
+        sales, sales.c.product_id == Product.id
+    ).filter(
+        Product.seller_id == seller_id
+    ).order_by(
+        sort_column.nulls_last(), Product.id
+    ).offset((page - 1) * per_page).limit(per_page).all()
+
+    total = db.session.query(func.count(Product.id)).filter(Product.seller_id == seller_id).scalar()
+    return [
+        {
+            "product_id": row.id,
+            "name": row.name,
+            "category": row.category,
+            "price": row.price,
+            "stock": row.stock or 0,
+            "units_sold": int(row.units_sold),
+            "revenue": float(row.revenue),
+            "orders": int(row.orders),
+            "days_of_stock": round(float(row.days_of_stock), 1) if row.days_of_stock is not None else None
+        }
+        for row in rows
+    ], total
+
+
+REPORT_BUILDERS = {
+    'dashboard': build_dashboard,
+    'analytics': build_analytics,
+    'earnings': build_earnings
+}
@@ -0,0 +1,123 @@
+# app/utils/stock_alerts.py
+from datetime import datetime
+from sqlalchemy import insert, update, func, tuple_
+from app import db
+from app.config import Config
+from app.models import Notification, Product, User
+
+# Products named in one alert; the rest are summarised as "and N more"
+ALERT_PRODUCT_NAMES = 5
+
+
+def seller_threshold():
+    """A seller's own low-stock threshold, or the configured default"""
+    return func.coalesce(User.low_stock_threshold, Config.LOW_STOCK_THRESHOLD)
+
+
+def _alert_message(products):
+    listed = ", ".join(f"{name} ({stock} left)" for _, name, stock in products[:ALERT_PRODUCT_NAMES])
+    if len(products) > ALERT_PRODUCT_NAMES:
+        listed += f" and {len(products) - ALERT_PRODUCT_NAMES} more"
+    noun = "product is" if len(products) == 1 else "products are"
+    return f"{len(products)} {noun} running low on stock: {listed}. Restock soon to avoid missed orders."
+
+
+def scan_low_stock(batch_size=None):
+    """
+    Alert sellers about products whose stock fell below their threshold.
+
+    Only products whose stock or threshold changed since they were last checked
+    are read: products.stock_changed_at marks them and has its own index, so a
+    run costs the number of changes rather than the catalog size. They are walked
+    by (seller_id, id), batch_size at a time, with one transaction per batch; a batch
+    ends between sellers, so a seller gets one alert per run unless more than
+    batch_size of their products changed. Each batch:
+    - clears low_stock_notified_at on products that were restocked, so they can alert again
+    - inserts one Notification per seller, in a single bulk INSERT, for products below
+      threshold that were not alerted yet, and marks them
+    - clears stock_changed_at, except on products that changed again since they were read
+
+    Returns (sellers_alerted, products_alerted, products_restocked).
+    """
+    batch_size = batch_size or Config.LOW_STOCK_SCAN_BATCH_SIZE
+    sellers_alerted = products_alerted = products_restocked = 0
+    last_key = (0, 0)
+
+    while True:
+        rows = db.session.query(
+            Product.id,
+            Product.seller_id,
+            Product.name,
+            Product.stock,
+            Product.low_stock_notified_at,
+            Product.stock_changed_at,
+            seller_threshold().label('threshold')
+        ).join(
+            User, User.id == Product.seller_id
+        ).filter(
+            Product.stock_changed_at.isnot(None),
+            tuple_(Product.seller_id, Product.id) > last_key
+        ).order_by(Product.seller_id, Product.id).limit(batch_size).all()
+        if not rows:
+            break
+        # Leave the last seller for the next batch when their products may continue there
+        if len(rows) == batch_size and rows[0].seller_id != rows[-1].seller_id:
+            rows = [row for row in rows if row.seller_id != rows[-1].seller_id]
+        last_key = (rows[-1].seller_id, rows[-1].id)
+        now = datetime.utcnow()
+
+        # Products back at or above the threshold can be alerted about again
+        restocked = [
+            row.id for row in rows
+            if row.low_stock_notified_at is not None and row.stock is not None and row.stock >= row.threshold
+        ]
+        if restocked:
+            db.session.execute(
+                update(Product).where(
+                    Product.id.in_(restocked)
+                ).values(low_stock_notified_at=None).execution_options(synchronize_session=False)
+            )
+
+        low = sorted(
+            (
+                row for row in rows
+                if row.low_stock_notified_at is None and row.stock is not None and row.stock < row.threshold
+            ),
+            key=lambda row: (row.seller_id, row.stock, row.id)
+        )
+        by_seller = {}
+        for row in low:
+            by_seller.setdefault(row.seller_id, []).append((row.id, row.name, row.stock))
+
+        if by_seller:
+            db.session.execute(insert(Notification), [
+                {
+                    "title": "Low stock alert",
+                    "message": _alert_message(products),
+                    "type": "stock",
+                    "sender_role": "system",
+                    "target_user": seller_id,
+                    "date": now,
+                    "read": False
+                }
+                for seller_id, products in by_seller.items()
+            ])
+            db.session.execute(
+                update(Product).where(
+                    Product.id.in_([row.id for row in low])
+                ).values(low_stock_notified_at=now).execution_options(synchronize_session=False)
+            )
+
+        # A product whose stock changed again after it was read keeps its mark for the next run
+        db.session.execute(
+            update(Product).where(
+                tuple_(Product.id, Product.stock_changed_at).in_([(row.id, row.stock_changed_at) for row in rows])
+            ).values(stock_changed_at=None).execution_options(synchronize_session=False)
+        )
+
+        db.session.commit()
+        sellers_alerted += len(by_seller)
+        products_alerted += len(low)
+        products_restocked += len(restocked)
+
+    return sellers_alerted, products_alerted, products_restocked
@@ -0,0 +1,86 @@
+# app/utils/user_search.py
+from sqlalchemy import Double, cast, column, func, inspect, literal, literal_column, select, table
+from app import db
+from app.models import User
+from utils.analytics import dialect_name
+from utils.pagination import encode_rank_cursor, after_rank_cursor
+
+# Trigram indexes cannot serve terms shorter than this; those fall back to a scan
+MIN_INDEXED_TERM = 3
+
+# SQLite: FTS5 table (trigram tokenizer) over users, maintained by triggers. Only
+# the migrations create it; a schema built with db.create_all() has none
+users_fts = table('users_fts', column('rowid'))
+
+# PostgreSQL: the pg_trgm GIN index ix_users_search_trgm is built on exactly this expression
+SEARCH_DOCUMENT = literal_column(
+    "(users.firstname || ' ' || users.secondname || ' ' || users.email || ' ' || coalesce(users.phone, ''))"
+)
+
+
+def _fts_phrase(term):
+    # A quoted phrase matches the term as a substring under the trigram tokenizer
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _has_fts_table():
+    return inspect(db.session.connection()).has_table('users_fts')
+
+
+def _scored_matches(term):
+    """
+    (statement, score) for users matching term by name, email or phone; lower
+    scores rank first. Uses the dialect's trigram index when one can serve the
+    term, otherwise a plain substring scan scored 0 (id order).
+    """
+    dialect = dialect_name()
+    if len(term) >= MIN_INDEXED_TERM and dialect == 'sqlite' and _has_fts_table():
+        score = func.bm25(literal_column('users_fts'))
+        stmt = select(User).join(
+            users_fts, users_fts.c.rowid == User.id
+        ).where(literal_column('users_fts').match(_fts_phrase(term)))
+        return stmt, score
+
+    if dialect == 'postgresql':
+        # similarity() is a float4; as a float8 the score compares exactly with the
+        # value returned to Python and stored in the cursor
+        score = -cast(func.similarity(SEARCH_DOCUMENT, term), Double)
+        # A complete '%term%' pattern (not concatenated in SQL) lets the planner use the trigram index
+        pattern = '%' + term.replace('/', '//').replace('%', '/%').replace('_', '/_') + '%'
+        return select(User).where(SEARCH_DOCUMENT.ilike(pattern, escape='/')), score
+
+    stmt = select(User).where(
+        User.firstname.icontains(term, autoescape=True) |
+        User.secondname.icontains(term, autoescape=True) |
+        User.email.icontains(term, autoescape=True) |
+        User.phone.icontains(term, autoescape=True)
+    )
+    return stmt, literal(0.0)
+
+
+def search_users(account_type, term, limit=10, cursor=None, page=1):
+    """
+    One page of users of account_type matching term, best match first, ordered by
+    (score, id). A cursor continues with keyset pagination after the previous page;
+    without one, `page` selects the page by offset. Returns
+    (users, total, next_cursor, has_more); raises ValueError for a malformed cursor.
+    """
+    stmt, score = _scored_matches(term.strip())
+    stmt = stmt.where(User.account_type == account_type)
+    total = db.session.execute(select(func.count()).select_from(stmt.subquery())).scalar()
+
+    score = score.label('score')
+    stmt = stmt.add_columns(score).order_by(score, User.id)
+    if cursor:
+        # Continue after the last user of the previous page
+        stmt = stmt.where(after_rank_cursor(score, User.id, cursor))
+    else:
+        stmt = stmt.offset((max(page, 1) - 1) * limit)
+
+    # Fetch one extra row to know whether another page exists
+    rows = db.session.execute(stmt.limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = encode_rank_cursor(rows[-1].score, rows[-1].User.id) if has_more else None
+    return [row.User for row in rows], total, next_cursor, has_more
@@ -41,26 +41,31 @@ const DashboardHome = () => {
         }
         setCategoryCounts(counts);
 
-        // Fetch buyer's orders
+        // Fetch buyer's order totals and most recent orders
+        // (the order list is paginated, so totals come from their own endpoint)
         if (user && user.id) {
-          const ordersRes = await fetch(
-            `http://localhost:5000/orders/${user.id}`,
+          const totalsRes = await fetch(
+            `http://localhost:5000/orders/${user.id}/totals`,
             { credentials: "include" }
           );
-          if (ordersRes.ok) {
-            const ordersData = await ordersRes.json();
-            const orders = Array.isArray(ordersData.orders)
-              ? ordersData.orders
-              : [];
+          if (totalsRes.ok) {
+            const totals = await totalsRes.json();
             setBuyerStats((prev) => ({
               ...prev,
-              totalOrders: orders.length,
-              totalSpent: orders.reduce(
-                (sum, order) => sum + (order.total || 0),
-                0
-              ),
+              totalOrders: totals.total_orders || 0,
+              totalSpent: totals.total_spent || 0,
             }));
-            setRecentOrders(orders.slice(0, 5));
+          }
+
+          const ordersRes = await fetch(
+            `http://localhost:5000/orders/${user.id}?summary=true&limit=5`,
+            { credentials: "include" }
+          );
+          if (ordersRes.ok) {
+            const ordersData = await ordersRes.json();
+            setRecentOrders(
+              Array.isArray(ordersData.orders) ? ordersData.orders : []
+            );
           }
         }
 
@@ -6,9 +6,21 @@ const OrderDetails = () => {
   const { user } = useContext(AuthContext);
   const [orders, setOrders] = useState([]);
   const [selectedOrder, setSelectedOrder] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
 
+  // One page of order history; pass the previous page's next_cursor to continue after it
+  const fetchOrderPage = async (cursor) => {
+    const params = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+    const res = await fetch(`http://localhost:5000/orders/${user.id}${params}`, {
+      credentials: "include",
+    });
+    if (!res.ok) throw new Error("Failed to fetch orders");
+    return res.json();
+  };
+
   useEffect(() => {
     async function fetchOrders() {
       if (!user || !user.id) {
@@ -17,12 +29,9 @@ const OrderDetails = () => {
         return;
       }
       try {
-        const res = await fetch(`http://localhost:5000/orders/${user.id}`, {
-          credentials: "include",
-        });
-        if (!res.ok) throw new Error("Failed to fetch orders");
-        const data = await res.json();
+        const data = await fetchOrderPage(null);
         setOrders(data.orders || []);
+        setNextCursor(data.next_cursor || null);
       } catch (err) {
         setError(err.message);
       } finally {
@@ -32,6 +41,19 @@ const OrderDetails = () => {
     fetchOrders();
   }, [user]);
 
+  const loadMoreOrders = async () => {
+    setLoadingMore(true);
+    try {
+      const data = await fetchOrderPage(nextCursor);
+      setOrders((prev) => [...prev, ...(data.orders || [])]);
+      setNextCursor(data.next_cursor || null);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (loading) return <div>Loading order history...</div>;
   if (error) return <div className="text-red-500">Error: {error}</div>;
 
@@ -85,6 +107,17 @@ const OrderDetails = () => {
             </tbody>
           </table>
         )}
+        {nextCursor && (
+          <div className="mt-6 text-center">
+            <button
+              className="bg-blue-500 text-white px-4 py-2 rounded hover:bg-blue-600 disabled:opacity-50"
+              onClick={loadMoreOrders}
+              disabled={loadingMore}
+            >
+              {loadingMore ? "Loading..." : "Load more orders"}
+            </button>
+          </div>
+        )}
       </div>
     );
   }
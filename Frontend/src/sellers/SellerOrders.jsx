@@ -246,14 +246,6 @@ export default function SellerOrders() {
                       </td>
                       <td className="px-6 py-4 whitespace-nowrap text-sm font-medium">
                         <div className="flex space-x-2">
-                          {order.status === 'pending' && (
-                            <button
-                              onClick={() => updateOrderStatus(order.id, 'processing')}
-                              className="px-3 py-1 bg-blue-600 text-white rounded hover:bg-blue-700"
-                            >
-                              Accept
-                            </button>
-                          )}
                           {order.status === 'processing' && (
                             <button
                               onClick={() => updateOrderStatus(order.id, 'shipped')}